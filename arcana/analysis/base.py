@@ -6,12 +6,13 @@ from collections import defaultdict
 import sys
 import os.path as op
 import types
+import weakref
 from copy import copy
 from logging import getLogger
 from nipype.interfaces.utility import IdentityInterface
 from arcana.pipeline import Pipeline
 from arcana.data import (
-    BaseData, BaseInputMixin, BaseInputSpecMixin, FilesetFilter, FieldFilter,
+    BaseInputMixin, BaseInputSpecMixin, FilesetFilter, FieldFilter,
     BaseFileset)
 from nipype.pipeline import engine as pe
 from .parameter import Parameter, SwitchSpec
@@ -19,7 +20,7 @@ from arcana.repository.interfaces import RepositorySource
 from arcana.repository import Dataset
 from arcana.processor import SingleProc
 from arcana.environment import StaticEnv
-from arcana.utils import get_class_info, wrap_text
+from arcana.utils import get_class_info, wrap_text, ExitStack
 from arcana.exceptions import (
     ArcanaMissingInputError, ArcanaNoConverterError, ArcanaDesignError,
     ArcanaCantPickleAnalysisError, ArcanaUsageError, ArcanaError,
@@ -76,27 +77,39 @@ class Analysis(object):
 
     _data_specs = {}
     _param_specs = {}
-
-    implicit_cls_attrs = ['_data_specs', '_param_specs']
+    _acquired_data_specs = ()
+    _derived_data_specs = ()
+    _acquired_data_spec_names = ()
+    _derived_data_spec_names = ()
+    _all_spec_names = ()
+    _all_spec_names_set = frozenset()
+
+    implicit_cls_attrs = ['_data_specs', '_param_specs',
+                          '_acquired_data_specs', '_derived_data_specs',
+                          '_acquired_data_spec_names',
+                          '_derived_data_spec_names', '_all_spec_names',
+                          '_all_spec_names_set',
+                          '_pickle_cls_dct', '_unpicklable_methods']
 
     SUBJECT_ID = 'subject_id'
     VISIT_ID = 'visit_id'
-    ITERFIELDS = (SUBJECT_ID, VISIT_ID)
+    ITERFIELDS = frozenset((SUBJECT_ID, VISIT_ID))
     FREQUENCIES = {
         'per_dataset': (),
         'per_subject': (SUBJECT_ID,),
         'per_visit': (VISIT_ID,),
         'per_session': (SUBJECT_ID, VISIT_ID)}
+    # Reverse lookup of frequencies from the (unordered) iterators
+    _FREQ_BY_ITERATORS = {frozenset(it): f for f, it in FREQUENCIES.items()}
 
     def __init__(self, name, dataset, processor, inputs,
                  environment=None, parameters=None, enforce_inputs=True):
-        try:
-            # This works for PY3 as the metaclass inserts it itself if
-            # it isn't provided
-            metaclass = type(self).__dict__['__metaclass__']
-            if not issubclass(metaclass, AnalysisMetaClass):
-                raise KeyError
-        except KeyError:
+        # NB: The metaclass inserts itself into the class dict as
+        # '__metaclass__' if it isn't provided. It needs to be looked up in the
+        # class's own dict as the class returned by the metaclass is a plain
+        # 'type', which isn't inherited by sub-classes
+        if not issubclass(type(self).__dict__.get('__metaclass__', type),
+                          AnalysisMetaClass):
             raise ArcanaUsageError(
                 "Need to have AnalysisMetaClass (or a sub-class) as "
                 "the metaclass of all classes derived from Analysis")
@@ -107,11 +120,13 @@ class Analysis(object):
         if environment is None:
             environment = StaticEnv()
         self._name = name
+        self._prefix = name + '_'
         self._dataset = dataset
         self._processor = processor.bind(self)
         self._environment = environment
         self._inputs = {}
-        # Initialise caches for data slices and pipeline objects
+        # Initialise caches for specs, data slices and pipeline objects
+        self._spec_cache = {}
         self._bound_specs = {}
         self._pipelines_cache = {}
         # Set parameters
@@ -121,11 +136,13 @@ class Analysis(object):
             # Convert list of parameters into dictionary
             parameters = {o.name: o for o in parameters}
         self._parameters = {}
-        for param_name, param in list(parameters.items()):
+        param_specs = self._param_specs
+        param_context = ' {}(name={})'.format(type(self).__name__, name)
+        for param_name, param in parameters.items():
             if not isinstance(param, Parameter):
                 param = Parameter(param_name, param)
             try:
-                param_spec = self._param_specs[param_name]
+                param_spec = param_specs[param_name]
             except KeyError:
                 raise ArcanaNameError(
                     param_name,
@@ -133,15 +150,16 @@ class Analysis(object):
                     "allowable parameters for {} classes ('{}')"
                     .format(param_name, type(self).__name__,
                             "', '".join(self.param_spec_names())))
-            param_spec.check_valid(param, context=' {}(name={})'.format(
-                type(self).__name__, name))
+            param_spec.check_valid(param, context=param_context)
             self._parameters[param_name] = param
         # Convert inputs to a dictionary if passed in as a list/tuple
         if not isinstance(inputs, dict):
             inputs = {i.name: i for i in inputs}
         else:
-            # Convert string patterns into Input objects
-            for inpt_name, inpt in list(inputs.items()):
+            # Convert string patterns into Input objects (NB: only the values
+            # of existing keys are replaced so the view can be iterated
+            # directly)
+            for inpt_name, inpt in inputs.items():
                 if isinstance(inpt, basestring):
                     spec = self.data_spec(inpt_name)
                     if spec.is_fileset:
@@ -155,8 +173,10 @@ class Analysis(object):
         # Check validity of analysis inputs
         for inpt_name, inpt in inputs.items():
             try:
-                spec = self.data_spec(inpt_name)
-            except ArcanaNameError:
+                spec = self._data_specs[inpt_name]
+            except KeyError:
+                # NB: The spec is looked up directly so the 'available specs'
+                # message of data_spec() isn't formatted only to be discarded
                 raise ArcanaNameError(
                     inpt.name,
                     "Input name '{}' isn't in data specs of {} ('{}')"
@@ -185,7 +205,7 @@ class Analysis(object):
                 raise ArcanaUsageError(
                     "No visit IDs provided and destination repository "
                     "is empty")
-            for inpt_name, inpt in list(inputs.items()):
+            for inpt_name, inpt in inputs.items():
                 try:
                     try:
                         self._inputs[inpt_name] = bound_inpt = inpt.bind(
@@ -229,9 +249,10 @@ class Analysis(object):
         if input_errors:
             raise ArcanaInputError('\n'.join(str(e) for e in input_errors))
         # Check remaining specs are optional or have default values
-        for spec in self.data_specs():
-            if spec.name not in self.input_names:
-                if not spec.derived and spec.default is None:
+        input_names = self._inputs.keys()
+        for spec in self._acquired_data_specs:
+            if spec.name not in input_names:
+                if spec.default is None:
                     # Emit a warning if an acquired fileset has not been
                     # provided for an "acquired fileset"
                     msg = (" input fileset '{}' was not provided to {}."
@@ -328,6 +349,21 @@ class Analysis(object):
              session_ids=session_ids, **kwargs)
         if derive:
             self._derive(names, subject_ids, visit_ids, session_ids, **kwargs)
+        if filter_items:
+            if subject_ids is None:
+                subject_ids = []
+            if visit_ids is None:
+                visit_ids = []
+            if session_ids is None:
+                session_ids = []
+            # Build the sets of IDs to filter by once for all names
+            subject_id_set = frozenset(subject_ids)
+            visit_id_set = frozenset(visit_ids)
+            session_id_set = frozenset(tuple(s) for s in session_ids)
+            subject_or_session_ids = subject_id_set.union(
+                s[0] for s in session_id_set)
+            visit_or_session_ids = visit_id_set.union(
+                s[1] for s in session_id_set)
         # Find and return Item/Slice corresponding to requested spec
         # names
         all_data = []
@@ -337,26 +373,18 @@ class Analysis(object):
             if single_item:
                 data = data.item(subject_id=subject_id, visit_id=visit_id)
             elif filter_items and spec.frequency != 'per_dataset':
-                if subject_ids is None:
-                    subject_ids = []
-                if visit_ids is None:
-                    visit_ids = []
-                if session_ids is None:
-                    session_ids = []
-                if spec.frequency == 'per_session':
+                frequency = spec.frequency
+                if frequency == 'per_session':
+                    data = [d for d in data
+                            if (d.subject_id in subject_id_set
+                                or d.visit_id in visit_id_set
+                                or d.session_id in session_id_set)]
+                elif frequency == 'per_subject':
                     data = [d for d in data
-                            if (d.subject_id in subject_ids
-                                or d.visit_id in visit_ids
-                                or d.session_id in session_ids)]
-                elif spec.frequency == 'per_subject':
-                    data = [
-                        d for d in data
-                        if (d.subject_id in subject_ids
-                            or d.subject_id in [s[0] for s in session_ids])]
-                elif spec.frequency == 'per_visit':
+                            if d.subject_id in subject_or_session_ids]
+                elif frequency == 'per_visit':
                     data = [d for d in data
-                            if (d.visit_id in visit_ids
-                                or d.visit_id in [s[1] for s in session_ids])]
+                            if d.visit_id in visit_or_session_ids]
                 if not data:
                     raise ArcanaUsageError(
                         "No matching data found (subject_ids={}, visit_ids={} "
@@ -372,10 +400,9 @@ class Analysis(object):
         """
         Internals of the dataset derivation
         """
-        specs = [self.spec(n) for n in names]
         # Work out which pipelines need to be run
         pipeline_getters = defaultdict(set)
-        for spec in specs:
+        for spec in map(self.spec, names):
             if spec.derived or spec.derivable:  # Filter out Analysis input
                 # Add name of spec to set of required outputs
                 pipeline_getters[(spec.pipeline_getter,
@@ -413,7 +440,6 @@ class Analysis(object):
         single_item = 'subject_id' in kwargs or 'visit_id' in kwargs
         filter_items = (subject_ids, visit_ids, session_ids) != (None, None,
                                                                  None)
-        specs = [self.spec(n) for n in names]
         subject_id = kwargs.pop('subject_id', None)
         visit_id = kwargs.pop('visit_id', None)
         if single_item:
@@ -422,8 +448,10 @@ class Analysis(object):
                     "Cannot provide 'subject_id' and/or 'visit_id' in "
                     "combination with 'subject_ids', 'visit_ids' or "
                     "'session_ids'")
-            iterators = set(chain(self.FREQUENCIES[s.frequency]
-                                  for s in specs))
+            # NB: The specs are only required to check the IDs of single
+            # items
+            iterators = set(chain(self.FREQUENCIES[self.spec(n).frequency]
+                                  for n in names))
             if subject_id is not None and visit_id is not None:
                 session_ids = [(subject_id, visit_id)]
             elif subject_id is not None:
@@ -555,22 +583,17 @@ class Analysis(object):
             if cls is not getattr(module, cls.__name__):
                 raise AttributeError
         except AttributeError:
-            cls_dct = {}
-            for name, attr in list(cls.__dict__.items()):
-                if isinstance(attr, types.FunctionType):
-                    try:
-                        if not attr.auto_added:
-                            raise ArcanaCantPickleAnalysisError()
-                    except (AttributeError, ArcanaCantPickleAnalysisError):
-                        raise ArcanaCantPickleAnalysisError(
-                            "Cannot pickle auto-generated analysis class "
-                            "as it contains non-auto-added method "
-                            "{}:{}".format(name, attr))
-                elif name not in self.implicit_cls_attrs:
-                    cls_dct[name] = attr
+            # The class attributes required to regenerate the class are
+            # collated by the metaclass when the class is created
+            if cls._unpicklable_methods:
+                name, attr = cls._unpicklable_methods[0]
+                raise ArcanaCantPickleAnalysisError(
+                    "Cannot pickle auto-generated analysis class "
+                    "as it contains non-auto-added method "
+                    "{}:{}".format(name, attr))
             pkld = (pickle_reconstructor,
                     (cls.__metaclass__, cls.__name__, cls.__bases__,  # noqa pylint: disable=no-member
-                     cls_dct), self.__dict__)
+                     cls._pickle_cls_dct), self.__dict__)
         else:
             # Use standard pickling if not a generated class
             pkld = object.__reduce__(self)
@@ -675,6 +698,7 @@ class Analysis(object):
         subsequent pipeline is run.
         """
         self.dataset.clear_cache()
+        self._spec_cache = {}
         self._bound_specs = {}
         self._pipelines_cache = {}
 
@@ -692,11 +716,11 @@ class Analysis(object):
 
     @property
     def inputs(self):
-        return list(self._inputs.values())
+        return self._inputs.values()
 
     @property
     def input_names(self):
-        return list(self._inputs.keys())
+        return self._inputs.keys()
 
     def input(self, name):
         try:
@@ -741,7 +765,7 @@ class Analysis(object):
     @property
     def prefix(self):
         """The analysis name as a prefix for fileset names"""
-        return self.name + '_'
+        return self._prefix
 
     @property
     def name(self):
@@ -814,12 +838,11 @@ class Analysis(object):
         return Pipeline(self, *args, **kwargs)
 
     def _get_parameter(self, name):
-        try:
-            parameter = self._parameters[name]
-        except KeyError:
-            try:
-                parameter = self._param_specs[name]
-            except KeyError:
+        parameter = self._parameters.get(name)
+        if parameter is None:
+            # Fallback to the default value of the parameter spec
+            parameter = self._param_specs.get(name)
+            if parameter is None:
                 raise ArcanaNameError(
                     name,
                     "Invalid parameter, '{}', in {} (valid '{}')"
@@ -965,13 +988,18 @@ class Analysis(object):
         """
         # If the provided "name" is actually a data item or parameter then
         # replace it with its name.
-        if isinstance(name, (BaseData, Parameter)):
-            name = name.name
+        name = getattr(name, 'name', name)
+        try:
+            return self._spec_cache[name]
+        except KeyError:
+            pass
         # If name is a parameter than return the parameter spec
         if name in self._param_specs:
-            return self._param_specs[name]
+            spec = self._param_specs[name]
         else:
-            return self.bound_spec(name)
+            spec = self.bound_spec(name)
+        self._spec_cache[name] = spec
+        return spec
 
     def bound_spec(self, name):
         """
@@ -985,11 +1013,12 @@ class Analysis(object):
         """
         # If the provided "name" is actually a data item or parameter then
         # replace it with its name.
-        if isinstance(name, BaseData):
-            name = name.name
-        try:
-            bound = self._inputs[name]
-        except KeyError:
+        name = getattr(name, 'name', name)
+        bound = self._inputs.get(name)
+        if bound is None:
+            # Specs are only cached after they have been checked below
+            bound = self._bound_specs.get(name)
+        if bound is None:
             # Get the spec from the class
             spec = self.data_spec(name)
             if not spec.derived and spec.default is None:
@@ -997,11 +1026,7 @@ class Analysis(object):
                     "Input (i.e. non-generated) data '{}' "
                     "was not supplied when the analysis '{}' was "
                     "initiated".format(name, self.name))
-            else:
-                try:
-                    bound = self._bound_specs[name]
-                except KeyError:
-                    bound = self._bound_specs[name] = spec.bind(self)
+            bound = self._bound_specs[name] = spec.bind(self)
         return bound
 
     @classmethod
@@ -1017,8 +1042,7 @@ class Analysis(object):
         """
         # If the provided "name" is actually a data item or parameter then
         # replace it with its name.
-        if isinstance(name, BaseData):
-            name = name.name
+        name = getattr(name, 'name', name)
         try:
             return cls._data_specs[name]
         except KeyError:
@@ -1026,7 +1050,7 @@ class Analysis(object):
                 name,
                 "No fileset spec named '{}' in {}, available:\n{}"
                 .format(name, cls.__name__,
-                        "\n".join(list(cls._data_specs.keys()))))
+                        "\n".join(cls._data_specs)))
 
     @classmethod
     def param_spec(cls, name):
@@ -1037,7 +1061,7 @@ class Analysis(object):
                 name,
                 "No parameter spec named '{}' in {}, available:\n{}"
                 .format(name, cls.__name__,
-                        "\n".join(list(cls._param_specs.keys()))))
+                        "\n".join(cls._param_specs)))
 
     @classmethod
     def data_specs(cls):
@@ -1060,8 +1084,7 @@ class Analysis(object):
 
     @classmethod
     def spec_names(cls):
-        return chain(cls.data_spec_names(),
-                     cls.param_spec_names())
+        return iter(cls._all_spec_names)
 
     @classmethod
     def acquired_data_specs(cls):
@@ -1069,7 +1092,7 @@ class Analysis(object):
         Lists all data_specs defined in the analysis class that are
         provided as inputs to the analysis
         """
-        return (c for c in cls.data_specs() if not c.derived)
+        return iter(cls._acquired_data_specs)
 
     @classmethod
     def derived_data_specs(cls):
@@ -1078,34 +1101,61 @@ class Analysis(object):
         generated from other data_specs (but can be overridden by input
         filesets)
         """
-        return (c for c in cls.data_specs() if c.derived)
+        return iter(cls._derived_data_specs)
 
     @classmethod
     def derived_data_spec_names(cls):
         """Lists the names of generated data_specs defined in the analysis"""
-        return (c.name for c in cls.derived_data_specs())
+        return iter(cls._derived_data_spec_names)
 
     @classmethod
     def acquired_data_spec_names(cls):
         "Lists the names of acquired data_specs defined in the analysis"
-        return (c.name for c in cls.acquired_data_specs())
+        return iter(cls._acquired_data_spec_names)
 
-    def cache_inputs(self):
+    def cache_inputs(self, use_workflow=False):
         """
         Runs the Analysis's repository source node for each of the inputs
         of the analysis, thereby caching any data required from remote
         repositorys. Useful when launching many parallel jobs that will
         all try to concurrently access the remote repository, and probably
         lead to timeout errors.
+
+        Parameters
+        ----------
+        use_workflow : bool
+            Cache the inputs by running a NiPype workflow containing a
+            repository source node instead of fetching them directly
         """
+        if not self._inputs:
+            return
+        if use_workflow:
+            self._cache_inputs_workflow()
+            return
+        # Only items stored in remote repositories need to be cached
+        items = [item for inpt in self.inputs
+                 for item in self.bound_spec(inpt).slice
+                 if (item.dataset is not None
+                     and not item.dataset.repository.is_local)]
+        if not items:
+            return
+        with ExitStack() as stack:
+            # Connect to each of the repositories once up front so the
+            # connection is reused for all of the items
+            for repository in set(i.dataset.repository for i in items):
+                stack.enter_context(repository)
+            for item in items:
+                item.get()
+
+    def _cache_inputs_workflow(self):
         workflow = pe.Workflow(name='cache_download',
                                base_dir=self.processor.work_dir)
         subjects = pe.Node(IdentityInterface(['subject_id']), name='subjects',
                            environment=self.environment)
         sessions = pe.Node(IdentityInterface(['subject_id', 'visit_id']),
                            name='sessions', environment=self.environment)
-        subjects.iterables = ('subject_id', tuple(self.subject_ids))
-        sessions.iterables = ('visit_id', tuple(self.visit_ids))
+        subjects.iterables = ('subject_id', self.subject_ids)
+        sessions.iterables = ('visit_id', self.visit_ids)
         source = pe.Node(RepositorySource(
             self.bound_spec(i).slice for i in self.inputs), name='source')
         workflow.connect(subjects, 'subject_id', sessions, 'subject_id')
@@ -1152,8 +1202,7 @@ class Analysis(object):
         """
         Returns the frequency corresponding to the given iterators
         """
-        return {
-            set(it): f for f, it in cls.FREQUENCIES.items()}[set(iterators)]
+        return cls._FREQ_BY_ITERATORS[frozenset(iterators)]
 
     @property
     def prov(self):
@@ -1222,95 +1271,189 @@ class AnalysisMetaClass(type):
             add_param_specs = dct['add_param_specs']
         except KeyError:
             add_param_specs = []
-        combined_attrs = set()
+        if (not add_data_specs and not add_param_specs
+                and len(bases) == 1):
+            # Nothing to add to the (already validated) specs of the base
+            # class. NB: the dicts are still copied as MultiAnalysisMetaClass
+            # adds translated specs to them after the class is created
+            combined_data_specs = dict(bases[0]._data_specs)
+            combined_param_specs = dict(bases[0]._param_specs)
+        else:
+            combined_data_specs, combined_param_specs = metacls._combine_specs(
+                name, bases, dct, add_data_specs, add_param_specs)
+        dct['_data_specs'] = combined_data_specs
+        dct['_param_specs'] = combined_param_specs
+        # NB: '__metaclass__' isn't used by Python 3 to determine the
+        # metaclass but is checked in Analysis.__init__ and used to regenerate
+        # classes when pickling
+        if '__metaclass__' not in dct:
+            dct['__metaclass__'] = metacls
+        # Append description of Analysis parameters to class
+        try:
+            docstring = dct['__doc__']
+        except KeyError:
+            docstring = '{} Analysis class'.format(name)
+        if 'Parameters' not in docstring:
+            docstring += Analysis.__doc__
+        dct['__doc__'] = docstring
+        cls = type(name, bases, dct)
+        metacls._cache_class_attrs(cls)
+        return cls
+
+    @staticmethod
+    def _combine_specs(name, bases, dct, add_data_specs, add_param_specs):
+        """
+        Combines the data and parameter specs added to the class with those
+        of its bases and checks that they are valid
+        """
         combined_data_specs = {}
         combined_param_specs = {}
         for base in reversed(bases):
-            # Get the combined class dictionary including base dicts
-            # excluding auto-added properties for data and parameter specs
-            combined_attrs.update(
-                a for a in dir(base) if (not issubclass(base, Analysis)
-                                         or a not in base.spec_names()))
             # TODO: need to check that fields are not overridden by filesets
             #       and vice-versa
+            # NB: The spec dicts of the bases are merged directly as they
+            # are already keyed by spec name
             try:
-                combined_data_specs.update(
-                    (d.name, d) for d in base.data_specs())
+                combined_data_specs.update(base._data_specs)
             except AttributeError:
                 pass  # Not a Analysis class
             try:
-                combined_param_specs.update(
-                    (p.name, p) for p in base.param_specs())
+                combined_param_specs.update(base._param_specs)
             except AttributeError:
                 pass  # Not a Analysis class
-        combined_attrs.update(list(dct.keys()))
-        combined_data_specs.update((d.name, d) for d in add_data_specs)
-        combined_param_specs.update(
-            (p.name, p) for p in add_param_specs)
+        combined_data_specs.update({d.name: d for d in add_data_specs})
+        combined_param_specs.update({p.name: p for p in add_param_specs})
         # Check that the pipeline names in data specs correspond to a
         # pipeline method in the class and that if a pipeline is called with
         # arguments (for parameterizing a range of metrics for example) then
         # the same argument names are consistent across every call.
         pipeline_arg_names = {}
         for spec in add_data_specs:
-            if spec.derived:
-                if spec.pipeline_getter in ('pipeline', 'new_pipeline'):
+            if not spec.derived:
+                continue
+            getter = spec.pipeline_getter
+            try:
+                arg_names = pipeline_arg_names[getter]
+            except KeyError:
+                # Only need to check the getter the first time it is
+                # encountered as several specs are typically generated by
+                # the same pipeline
+                if getter in ('pipeline', 'new_pipeline'):
                     raise ArcanaDesignError(
                         "Cannot use the names 'pipeline' or  'new_pipeline' "
                         "('{}') for the name of a pipeline constructor in "
                         "class {} as it clashes with base method to create "
                         "pipelines"
-                        .format(spec.pipeline_getter, name))
-                if spec.pipeline_getter not in combined_attrs:
+                        .format(getter, name))
+                # Look up the pipeline getter in the class and base
+                # attributes rather than combining all attributes up front
+                if not (getter in dct
+                        or any(getter in _base_attrs(b) for b in bases)):
                     raise ArcanaDesignError(
                         "Pipeline to generate '{}', '{}', is not present"
-                        " in '{}' class".format(
-                            spec.name, spec.pipeline_getter, name))
-                try:
-                    if pipeline_arg_names[
-                            spec.pipeline_getter] != spec.pipeline_arg_names:
-                        raise ArcanaDesignError(
-                            "Inconsistent pipeline argument names used for "
-                            "'{}' pipeline getter {} and {}".format(
-                                spec.pipeline_getter,
-                                pipeline_arg_names[spec.pipeline_getter],
-                                spec.pipeline_arg_names))
-                except KeyError:
-                    pipeline_arg_names[
-                        spec.pipeline_getter] = spec.pipeline_arg_names
-        # Check for name clashes between data and parameter specs
-        spec_name_clashes = (set(combined_data_specs)
-                             & set(combined_param_specs))
-        if spec_name_clashes:
+                        " in '{}' class".format(spec.name, getter, name))
+                pipeline_arg_names[getter] = spec.pipeline_arg_names
+            else:
+                if arg_names != spec.pipeline_arg_names:
+                    raise ArcanaDesignError(
+                        "Inconsistent pipeline argument names used for "
+                        "'{}' pipeline getter {} and {}".format(
+                            getter, arg_names, spec.pipeline_arg_names))
+        # Check for name clashes between data and parameter specs and with
+        # reserved names. The lists of clashing names are only built if
+        # there are any
+        data_spec_names = combined_data_specs.keys()
+        if not data_spec_names.isdisjoint(combined_param_specs):
+            spec_name_clashes = [n for n in data_spec_names
+                                 if n in combined_param_specs]
             raise ArcanaDesignError(
                 "'{}' name both data and parameter specs in '{}' class"
                 .format("', '".join(spec_name_clashes), name))
-        reserved_clashes = [n for n in combined_data_specs
-                            if n in Analysis.ITERFIELDS]
-        if reserved_clashes:
+        if not data_spec_names.isdisjoint(Analysis.ITERFIELDS):
+            reserved_clashes = [n for n in data_spec_names
+                                if n in Analysis.ITERFIELDS]
             raise ArcanaDesignError(
                 "'{}' data spec names clash with reserved names in {}"
                 .format("', '".join(reserved_clashes), name))
-        dct['_data_specs'] = combined_data_specs
-        dct['_param_specs'] = combined_param_specs
-        if '__metaclass__' not in dct:
-            dct['__metaclass__'] = metacls
-        # Append description of Analysis parameters to class
-        try:
-            docstring = dct['__doc__']
-        except KeyError:
-            docstring = '{} Analysis class'.format(name)
-        if 'Parameters' not in docstring:
-            docstring += Analysis.__doc__
-        dct['__doc__'] = docstring
-        return type(name, bases, dct)
+        return combined_data_specs, combined_param_specs
+
+    @staticmethod
+    def _cache_class_attrs(cls):
+        """
+        Partitions the data specs of the class into acquired and derived
+        tuples so they don't need to be filtered each time they are listed,
+        and collates the class attributes required to pickle instances of
+        generated classes. Needs to be called again if the class is modified
+        after it is created (e.g. by MultiAnalysisMetaClass)
+        """
+        data_specs = tuple(cls._data_specs.values())
+        cls._acquired_data_specs = tuple(s for s in data_specs
+                                         if not s.derived)
+        cls._derived_data_specs = tuple(s for s in data_specs if s.derived)
+        cls._acquired_data_spec_names = tuple(
+            s.name for s in cls._acquired_data_specs)
+        cls._derived_data_spec_names = tuple(
+            s.name for s in cls._derived_data_specs)
+        cls._all_spec_names = tuple(chain(cls._data_specs, cls._param_specs))
+        cls._all_spec_names_set = frozenset(cls._all_spec_names)
+        pickle_cls_dct = {}
+        unpicklable_methods = []
+        for name, attr in cls.__dict__.items():
+            if isinstance(attr, types.FunctionType):
+                if not getattr(attr, 'auto_added', False):
+                    unpicklable_methods.append((name, attr))
+            elif name not in cls.implicit_cls_attrs:
+                pickle_cls_dct[name] = attr
+        cls._pickle_cls_dct = pickle_cls_dct
+        cls._unpicklable_methods = tuple(unpicklable_methods)
+
+
+# Attribute names of classes that have been used as bases of analysis classes
+_BASE_ATTRS_CACHE = weakref.WeakKeyDictionary()
+
+
+def _base_attrs(base):
+    """
+    Returns the names of the attributes of a base class, excluding the names
+    of the data and parameter specs of analysis classes. Cached as classes
+    aren't expected to be modified after they have been sub-classed.
+    """
+    try:
+        return _BASE_ATTRS_CACHE[base]
+    except KeyError:
+        # NB: Unions the class dicts along the MRO directly instead of calling
+        # dir(), which also sorts the names. Attributes of 'object' are
+        # skipped as they can't be pipeline constructors
+        attrs = frozenset().union(*(vars(k) for k in base.__mro__
+                                    if k is not object))
+        if issubclass(base, Analysis):
+            attrs -= base._all_spec_names_set
+        _BASE_ATTRS_CACHE[base] = attrs
+        return attrs
 
 
-def pickle_reconstructor(metacls, name, bases, cls_dict):
-    obj = DummyObject()
-    obj.__class__ = metacls(name, bases, cls_dict)
-    return obj
+# Generated analysis classes that have been regenerated when unpickling
+_RECONSTRUCTED_CLASSES = weakref.WeakValueDictionary()
 
 
-class DummyObject(object):
-    pass
+def pickle_reconstructor(metacls, name, bases, cls_dict):
+    # Reuse the class regenerated by a previous unpickle if it was created
+    # from a matching class dict instead of rerunning the metaclass
+    key = (metacls, name, bases, cls_dict.get('__module__'))
+    cls = _RECONSTRUCTED_CLASSES.get(key)
+    if cls is None or not _matching_cls_dicts(cls._pickle_cls_dct, cls_dict):
+        cls = _RECONSTRUCTED_CLASSES[key] = metacls(name, bases, cls_dict)
+    # Create the instance without calling __init__, its state is restored by
+    # pickle from the instance dict
+    return object.__new__(cls)
+
+
+def _matching_cls_dicts(dct, other):
+    """
+    Checks whether two pickled class dicts define the same generated class.
+    Dunder attributes (e.g. '__dict__' descriptors) are only checked for
+    presence as they are either derived from the class name or specific to
+    the class object.
+    """
+    return dct.keys() == other.keys() and all(
+        dct[k] == other[k] for k in dct if not k.startswith('__'))
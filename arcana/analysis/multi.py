@@ -1,5 +1,6 @@
 from past.builtins import basestring
 from builtins import object
+import sys
 from arcana.exceptions import (
     ArcanaMissingDataException, ArcanaNameError)
 from arcana.exceptions import ArcanaUsageError
@@ -74,13 +75,9 @@ class MultiAnalysis(Analysis):
 
     def __init__(self, name, dataset, processor, inputs,
                  parameters=None, **kwargs):
-        try:
-            # This works for PY3 as the metaclass inserts it itself if
-            # it isn't provided
-            metaclass = type(self).__dict__['__metaclass__']
-            if not issubclass(metaclass, MultiAnalysisMetaClass):
-                raise KeyError
-        except KeyError:
+        # See note on metaclass check in Analysis.__init__
+        if not issubclass(type(self).__dict__.get('__metaclass__', type),
+                          MultiAnalysisMetaClass):
             raise ArcanaUsageError(
                 "Need to set MultiAnalysisMetaClass (or sub-class) as "
                 "the metaclass of all classes derived from "
@@ -106,11 +103,9 @@ class MultiAnalysis(Analysis):
                         if inpt.derived:
                             mapped_inputs[data_name] = inpt
             # Map parameters to the subcomp
-            mapped_parameters = {}
-            for param_name in subcomp_cls.param_spec_names():
-                mapped_name = subcomp_spec.map(param_name)
-                parameter = self._get_parameter(mapped_name)
-                mapped_parameters[param_name] = parameter
+            mapped_parameters = {
+                n: self._get_parameter(subcomp_spec.map(n))
+                for n in subcomp_cls.param_spec_names()}
             # Create sub-analysis
             with dataset.repository:
                 subcomp = subcomp_spec.analysis_class(
@@ -242,8 +237,8 @@ class SubCompSpec(object):
 
     @property
     def name_map(self):
-        nmap = dict((s.name, self.apply_prefix(s.name))
-                    for s in self.auto_data_specs)
+        nmap = {s.name: self.apply_prefix(s.name)
+                for s in self.auto_data_specs}
         nmap.update(self._name_map)
         return nmap
 
@@ -262,7 +257,10 @@ class SubCompSpec(object):
             return self.apply_prefix(name)
 
     def apply_prefix(self, name):
-        return self.name + '_' + name
+        # NB: Prefixed names are interned as they key the translated specs
+        # and pipeline getters of the multi-analysis class, so lookups by
+        # (interned) string literals can match on identity
+        return sys.intern(self.name + '_' + name)
 
     @property
     def auto_data_specs(self):
@@ -315,7 +313,7 @@ class MultiAnalysisMetaClass(AnalysisMetaClass):
         cls = AnalysisMetaClass(name, bases, dct)
         # Loop through all data specs that haven't been explicitly
         # mapped and add a data spec in the multi class.
-        for subcomp_spec in list(subcomp_specs.values()):
+        for subcomp_spec in subcomp_specs.values():
             # Map data specs
             for data_spec in subcomp_spec.auto_data_specs:
                 trans_sname = subcomp_spec.apply_prefix(
@@ -355,22 +353,24 @@ class MultiAnalysisMetaClass(AnalysisMetaClass):
                     renamed_spec = param_spec.renamed(trans_sname)
                     cls._param_specs[
                         renamed_spec.name] = renamed_spec
+        # Update the cached class attributes to include the translated specs
+        # and pipeline getters
+        metacls._cache_class_attrs(cls)
         # Check all names in name-map correspond to data or parameter
         # specs
-        for subcomp_spec in list(subcomp_specs.values()):
-            local_spec_names = list(
-                subcomp_spec.analysis_class.spec_names())
+        for subcomp_spec in subcomp_specs.values():
+            analysis_class = subcomp_spec.analysis_class
             for (local_name,
                  global_name) in subcomp_spec._name_map.items():
-                if local_name not in local_spec_names:
+                if local_name not in analysis_class._all_spec_names_set:
                     raise ArcanaUsageError(
                         "'{}' in name-map for '{}' sub analysis spec in {}"
                         "MultiAnalysis class does not name a spec in {} "
                         "class:\n{}"
                         .format(local_name, subcomp_spec.name,
                                 name, subcomp_spec.analysis_class,
-                                '\n'.join(local_spec_names)))
-                if global_name not in cls.spec_names():
+                                '\n'.join(analysis_class.spec_names())))
+                if global_name not in cls._all_spec_names_set:
                     raise ArcanaUsageError(
                         "'{}' in name-map for '{}' sub analysis spec in {}"
                         "MultiAnalysis class does not name a spec:\n{}"
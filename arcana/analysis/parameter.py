@@ -118,7 +118,7 @@ class ParamSpec(Parameter):
             self.name, self.default, self.desc)
 
     def check_valid(self, parameter, context=None):
-        context_str = 'in ' + context if context is not None else ''
+        context_str = ' in ' + context.strip() if context else ''
         if parameter.value is not None:
             if self.array:
                 errors = []
@@ -139,13 +139,13 @@ class ParamSpec(Parameter):
         if value != self.default:
             if not isinstance(value, self.dtype):
                 raise ArcanaIvalidParameterError(
-                    "Incorrect datatype for '{}' parameter provided ({}) {}. "
+                    "Incorrect datatype for '{}' parameter provided ({}){}. "
                     "Should be {}"
                     .format(param_name, type(value), context_str, self.dtype))
             if self.choices is not None and value not in self.choices:
                 raise ArcanaIvalidParameterError(
-                    "Ivalid value for '{}' parameter provided ({}){}. Can be "
-                    "one of {}".format(param_name, type(value), context_str,
+                    "Invalid value for '{}' parameter provided ({}){}. Can be "
+                    "one of {}".format(param_name, value, context_str,
                                        self.choices))
 
     def with_new_default(self, new_default):
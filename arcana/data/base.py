@@ -1,4 +1,5 @@
 from past.builtins import basestring
+import sys
 from builtins import object
 from abc import ABCMeta
 from .file_format import FileFormat
@@ -23,7 +24,9 @@ class BaseData(object, metaclass=ABCMeta):
         if frequency not in self.VALID_FREQUENCIES:
             raise ArcanaError(
                 "Unrecognised frequency '{}'".format(frequency))
-        self._name = name
+        # NB: Names are interned so the name comparisons made when matching
+        # items in the tree against specs and inputs can succeed on identity
+        self._name = sys.intern(name) if type(name) is str else name
         self._frequency = frequency
 
     def __eq__(self, other):
@@ -175,8 +175,8 @@ class FileFormat(object):
         aux_paths : dict[str, str]
             A dictionary of auxiliary file names and default paths
         """
-        return dict((n, primary_path[:-len(self.ext)] + ext)
-                    for n, ext in self.aux_files.items())
+        base_path = primary_path[:-len(self.ext)]
+        return {n: base_path + ext for n, ext in self.aux_files.items()}
 
     @property
     def aux_file_exts(self):
@@ -1,8 +1,8 @@
 from builtins import object
 from past.builtins import basestring
+import sys
 import re
 from copy import copy
-from itertools import chain
 from arcana.exceptions import (
     ArcanaUsageError, ArcanaInputError,
     ArcanaInputMissingMatchError, ArcanaNotBoundToAnalysisError)
@@ -20,7 +20,12 @@ class BaseInputMixin(object):
                  skip_missing=False, drop_if_missing=False,
                  fallback_to_default=False, dataset=None,
                  analysis_=None, slice_=None):
+        # Plain (non-regex) patterns are compared against item names, which
+        # are interned (see BaseData.__init__)
+        if not is_regex and type(pattern) is str:
+            pattern = sys.intern(pattern)
         self._pattern = pattern
+        self._pattern_re = None
         self._is_regex = is_regex
         self._order = order
         self._from_analysis = from_analysis
@@ -77,6 +82,13 @@ class BaseInputMixin(object):
     def pattern(self):
         return self._pattern
 
+    @property
+    def pattern_re(self):
+        # Compiled on first use and then reused for every node matched
+        if self._pattern_re is None:
+            self._pattern_re = re.compile(self.pattern)
+        return self._pattern_re
+
     @property
     def spec_name(self):
         return self.name
@@ -196,18 +208,7 @@ class BaseInputMixin(object):
         return self.name
 
     def nodes(self, tree):
-        # Run the match against the tree
-        if self.frequency == 'per_session':
-            nodes = chain(*(s.sessions for s in tree.subjects))
-        elif self.frequency == 'per_subject':
-            nodes = tree.subjects
-        elif self.frequency == 'per_visit':
-            nodes = tree.visits
-        elif self.frequency == 'per_dataset':
-            nodes = [tree]
-        else:
-            assert False, "Unrecognised frequency '{}'".format(self.frequency)
-        return nodes
+        return tree.nodes(self.frequency)
 
     def _match(self, tree, item_cls, **kwargs):
         matches = []
@@ -449,7 +450,7 @@ class FilesetFilter(BaseInputMixin, BaseFileset):
     def _filtered_matches(self, node, valid_formats=None, **kwargs):  # noqa: E501 @UnusedVariable
         if self.pattern is not None:
             if self.is_regex:
-                pattern_re = re.compile(self.pattern)
+                pattern_re = self.pattern_re
                 matches = [f for f in node.filesets
                            if pattern_re.match(f.basename)]
             else:
@@ -629,7 +630,7 @@ class FieldFilter(BaseInputMixin, BaseField):
 
     def _filtered_matches(self, node, **kwargs):
         if self.is_regex:
-            pattern_re = re.compile(self.pattern)
+            pattern_re = self.pattern_re
             matches = [f for f in node.fields
                        if pattern_re.match(f.name)]
         else:
@@ -385,8 +385,8 @@ class Fileset(BaseItemMixin, BaseFileset):
                 "Cannot get paths of fileset ({}) that hasn't had its format "
                 "set".format(self))
         if self.format.directory:
-            return chain(*((op.join(root, f) for f in files)
-                           for root, _, files in os.walk(self.path)))
+            return (op.join(root, f)
+                    for root, _, files in os.walk(self.path) for f in files)
         else:
             return chain([self.path], self.aux_files.values())
 
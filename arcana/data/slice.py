@@ -3,9 +3,8 @@ from arcana.exceptions import (
     ArcanaError, ArcanaUsageError, ArcanaIndexError)
 from .base import BaseFileset, BaseField
 from .item import Fileset, Field
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
 from operator import itemgetter
-from itertools import chain
 
 
 DICOM_SERIES_NUMBER_TAG = ('0020', '0011')
@@ -35,12 +34,15 @@ class BaseSliceMixin(object):
                 slce = list(slce)
             self._slice = slce
         elif frequency == 'per_session':
-            self._slice = OrderedDict()
-            for subj_id in sorted(set(c.subject_id for c in slce)):
-                self._slice[subj_id] = OrderedDict(
-                    sorted(((c.visit_id, c) for c in slce
-                            if c.subject_id == subj_id),
-                           key=itemgetter(0)))
+            # Group the items by subject in a single pass instead of
+            # rescanning the whole slice for each subject
+            by_subject = defaultdict(list)
+            for c in slce:
+                by_subject[c.subject_id].append((c.visit_id, c))
+            self._slice = OrderedDict(
+                (subj_id, OrderedDict(sorted(by_subject[subj_id],
+                                             key=itemgetter(0))))
+                for subj_id in sorted(by_subject))
         elif frequency == 'per_subject':
             self._slice = OrderedDict(
                 sorted(((c.subject_id, c) for c in slce),
@@ -60,8 +62,7 @@ class BaseSliceMixin(object):
         if self._frequency == 'per_dataset':
             return iter(self._slice)
         elif self._frequency == 'per_session':
-            return chain(*(c.values()
-                           for c in self._slice.values()))
+            return (i for c in self._slice.values() for i in c.values())
         else:
             return iter(self._slice.values())
 
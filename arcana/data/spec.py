@@ -169,7 +169,7 @@ class BaseSpecMixin(object):
 
     def __hash__(self):
         return (hash(self.pipeline_getter) ^ hash(self.desc)
-                ^ hash(self.pipeline_args.items()) ^ hash(self.group))
+                ^ hash(self.pipeline_args) ^ hash(self.group))
 
     def initkwargs(self):
         dct = {}
@@ -235,22 +235,7 @@ class BaseSpecMixin(object):
         """
         Returns the relevant nodes for the spec's frequency
         """
-        # Run the match against the tree
-        if self.frequency == 'per_session':
-            nodes = []
-            for subject in tree.subjects:
-                for sess in subject.sessions:
-                    nodes.append(sess)
-        elif self.frequency == 'per_subject':
-            nodes = tree.subjects
-        elif self.frequency == 'per_visit':
-            nodes = tree.visits
-        elif self.frequency == 'per_dataset':
-            nodes = [tree]
-        else:
-            assert False, "Unrecognised frequency '{}'".format(
-                self.frequency)
-        return nodes
+        return tree.nodes(self.frequency)
 
     @property
     def derivable(self):
@@ -263,9 +263,9 @@ class ModulesEnv(Environment):
     def _run_module_cmd(cls, *args):
         if 'MODULESHOME' in os.environ:
             try:
-                modulecmd = sp.check_output('which modulecmd',
-                                            shell=True).decode('utf-8').strip()
-            except sp.CalledProcessError:
+                modulecmd = sp.check_output(
+                    ['which', 'modulecmd']).decode('utf-8').strip()
+            except (sp.CalledProcessError, OSError):
                 modulecmd = False
             if not modulecmd:
                 modulecmd = '{}/bin/modulecmd'.format(
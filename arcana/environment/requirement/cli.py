@@ -76,7 +76,7 @@ class CliRequirement(BaseRequirement):
         if cmd is None:
             cmd = self.test_cmd
         try:
-            location = sp.check_output('which {}'.format(cmd), shell=True)
+            location = sp.check_output(['which', cmd])
         except sp.CalledProcessError as e:
             if e.returncode == 1:
                 raise ArcanaRequirementNotFoundError(
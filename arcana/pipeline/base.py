@@ -120,14 +120,16 @@ class Pipeline(object):
                                       self.name)
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, self.__class__):
             return False
+        # NB: dict key views compare as sets
         return (
             self._name == other._name and
             self._desc == other._desc and
-            set(self._input_conns.keys()) == set(other._input_conns.keys()) and
-            (set(self._output_conns.keys()) ==
-             set(other._output_conns.keys())) and
+            self._input_conns.keys() == other._input_conns.keys() and
+            self._output_conns.keys() == other._output_conns.keys() and
             self._citations == other._citations)
 
     def __hash__(self):
@@ -776,6 +778,9 @@ class Pipeline(object):
         # Generate input node and connect it to appropriate nodes
         inputnode = self.add('{}_inputnode'.format(frequency),
                              IdentityInterface(fields=input_names))
+        # Converters resolved for pairs of formats, which are reused across
+        # inputs that require the same conversion
+        converters = {}
         # Loop through list of nodes connected to analysis data specs and
         # connect them to the newly created input node
         for input_name, input in inputs.items():
@@ -789,20 +794,20 @@ class Pipeline(object):
                 # and connect input to that before connecting to inputnode
                 if self.requires_conversion(input, format):
                     try:
-                        conv = format.converter_from(input.format,
-                                                     **conv_kwargs)
-                    except ArcanaNoConverterError as e:
-                        e.msg += (
-                            "which is required to convert '{}' from {} to {} "
-                            "for '{}' input of '{}' node in '{}' pipeline"
-                            .format(
-                                input.name, input.format, format, node_in,
-                                node.name, self.name))
-                        raise e
-                    try:
-                        in_node = prev_conv_nodes[format.name]
+                        in_node, conv = prev_conv_nodes[format.name]
                     except KeyError:
-                        in_node = prev_conv_nodes[format.name] = self.add(
+                        try:
+                            conv = self._converter(input.format, format,
+                                                   conv_kwargs, converters)
+                        except ArcanaNoConverterError as e:
+                            e.msg += (
+                                "which is required to convert '{}' from {} to "
+                                "{} for '{}' input of '{}' node in '{}' "
+                                "pipeline".format(
+                                    input.name, input.format, format, node_in,
+                                    node.name, self.name))
+                            raise e
+                        in_node = self.add(
                             'conv_{}_to_{}_format'.format(input.name,
                                                           format.name),
                             conv.interface,
@@ -810,6 +815,7 @@ class Pipeline(object):
                             requirements=conv.requirements,
                             mem_gb=conv.mem_gb,
                             wall_time=conv.wall_time)
+                        prev_conv_nodes[format.name] = (in_node, conv)
                     try:
                         in_node_out = conv.output_aux(format.aux_name)
                     except AttributeError:  # Not an auxiliary pointer
@@ -853,6 +859,9 @@ class Pipeline(object):
         # Generate output node and connect it to appropriate nodes
         outputnode = self.add('{}_outputnode'.format(frequency),
                               IdentityInterface(fields=output_names))
+        # Converters resolved for pairs of formats, which are reused across
+        # outputs that require the same conversion
+        converters = {}
         # Loop through list of nodes connected to analysis data specs and
         # connect them to the newly created output node
         for output_name, output in outputs.items():
@@ -863,7 +872,8 @@ class Pipeline(object):
             # and connect output to that before connecting to outputnode
             if self.requires_conversion(output, format):
                 try:
-                    conv = output.format.converter_from(format, **conv_kwargs)
+                    conv = self._converter(format, output.format, conv_kwargs,
+                                           converters)
                 except ArcanaNoConverterError as e:
                     e.msg += (", which is required to convert '{}' output of "
                               "'{}' node in '{}' pipeline".format(
@@ -880,6 +890,36 @@ class Pipeline(object):
             self.connect(node, node_out, outputnode, output.name)
         return outputnode
 
+    def _converter(self, from_format, to_format, conv_kwargs, converters):
+        """
+        Returns a converter between the given formats, reusing one that has
+        already been resolved for the same formats and (hashable) kwargs if
+        present
+
+        Parameters
+        ----------
+        from_format : FileFormat
+            The format to convert from
+        to_format : FileFormat
+            The format to convert to
+        conv_kwargs : dict[str, *]
+            Keyword arguments passed to the converter
+        converters : dict[tuple, Converter]
+            Previously resolved converters, which is updated in place
+        """
+        key = (from_format.name, to_format.name)
+        if conv_kwargs:
+            key += tuple(sorted(conv_kwargs.items()))
+        try:
+            conv = converters[key]
+        except KeyError:
+            conv = converters[key] = to_format.converter_from(from_format,
+                                                              **conv_kwargs)
+        except TypeError:
+            # Unhashable kwarg values (e.g. lists) so resolve without caching
+            conv = to_format.converter_from(from_format, **conv_kwargs)
+        return conv
+
     def _gen_prov(self):
         """
         Extracts provenance information from the pipeline into a PipelineProv
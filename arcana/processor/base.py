@@ -2,10 +2,11 @@ from builtins import object
 import os  # @UnusedImport
 from pprint import pformat
 import os.path as op
-from collections import defaultdict, OrderedDict
+from collections import OrderedDict, defaultdict
 import shutil
+import hashlib
 from itertools import repeat
-from copy import copy, deepcopy
+from copy import copy
 from logging import getLogger
 import numpy as np
 from nipype.pipeline import engine as pe
@@ -70,6 +71,7 @@ class Processor(object):
     DEFAULT_MEM_GB = 4
 
     WORKFLOW_MAX_NAME_LEN = 100
+    WORKFLOW_NAME_HASH_LEN = 8
 
     # The default paths in the provenance JSON to check for mismatches that
     # would require the derivative to be reprocessed
@@ -94,10 +96,9 @@ class Processor(object):
         self._reprocess = reprocess
         self._prov_check = prov_check
         self._prov_ignore = prov_ignore
-        self._plugin_args = copy(self.default_plugin_args)
+        self._plugin_args = dict(self.default_plugin_args, **kwargs)
         self._default_wall_time = default_wall_time
         self._deffault_mem_gb = default_mem_gb
-        self._plugin_args.update(kwargs)
         self._init_plugin()
         self._analysis = None
         self._clean_work_dir_between_runs = clean_work_dir_between_runs
@@ -107,6 +108,8 @@ class Processor(object):
             type(self).__name__, self._work_dir)
 
     def __eq__(self, other):
+        if self is other:
+            return True
         try:
             return (
                 self._work_dir == other._work_dir
@@ -116,6 +119,19 @@ class Processor(object):
         except AttributeError:
             return False
 
+    def __hash__(self):
+        # NB: 'reprocess' isn't included as it can be changed after the
+        # processor is created (equal processors still hash the same)
+        try:
+            plugin_args_hash = hash(tuple(sorted(self._plugin_args.items())))
+        except TypeError:
+            # Fallback to the keys of the plugin args if the values aren't
+            # hashable
+            plugin_args_hash = hash(tuple(sorted(self._plugin_args)))
+        return (hash(self._work_dir)
+                ^ hash(self._max_process_time)
+                ^ plugin_args_hash)
+
     def _init_plugin(self):
         self._plugin = self.nipype_plugin_cls(**self._plugin_args)  # noqa pylint: disable=no-member
 
@@ -148,7 +164,13 @@ class Processor(object):
         return self._default_wall_time
 
     def bind(self, analysis):
-        cpy = deepcopy(self)
+        # Make a shallow copy of the processor instead of a deep copy, as the
+        # only mutable state is the plugin args and the NiPype plugin, which
+        # is regenerated from them (see __setstate__)
+        cpy = type(self).__new__(type(self))
+        cpy.__dict__.update(self.__dict__)
+        cpy._plugin_args = copy(self._plugin_args)
+        cpy._init_plugin()
         cpy._analysis = analysis
         return cpy
 
@@ -204,14 +226,21 @@ class Processor(object):
         required_outputs = kwargs.pop('required_outputs', repeat(None))
         # Create name by combining pipelines
         name = '_'.join(p.name for p in pipelines)
+        # Trim the end of very large names to avoid problems with
+        # workflow names exceeding system limits, appending a hash of the
+        # full name so that different combinations of pipelines with a common
+        # prefix don't end up sharing the same work directory
+        if len(name) > self.WORKFLOW_MAX_NAME_LEN:
+            name_hash = hashlib.md5(name.encode()).hexdigest()[
+                :self.WORKFLOW_NAME_HASH_LEN]
+            name = (name[:(self.WORKFLOW_MAX_NAME_LEN
+                           - self.WORKFLOW_NAME_HASH_LEN - 1)]
+                    + '_' + name_hash)
         # Clean work dir if required
         if clean_work_dir:
             workflow_work_dir = op.join(self.work_dir, name)
             if op.exists(workflow_work_dir):
                 shutil.rmtree(workflow_work_dir)
-        # Trim the end of very large names to avoid problems with
-        # workflow names exceeding system limits.
-        name = name[:self.WORKFLOW_MAX_NAME_LEN]
         workflow = pe.Workflow(name=name, base_dir=self.work_dir)
 
         # Generate filter array to optionally restrict the run to certain
@@ -278,10 +307,11 @@ class Processor(object):
             """
             if req_outputs is None:
                 req_outputs = pipeline.output_names
-            # Check downstream piplines for circular dependencies
-            downstream_pipelines = [p for p, _ in downstream]
-            if pipeline in downstream_pipelines:
-                recur_index = downstream_pipelines.index(pipeline)
+            # Check downstream piplines for circular dependencies, only
+            # locating the index of the recurrence if one is found
+            if any(p == pipeline for p, _ in downstream):
+                recur_index = next(i for i, (p, _) in enumerate(downstream)
+                                   if p == pipeline)
                 raise ArcanaDesignError(
                     "{} cannot be a dependency of itself. Call-stack:\n{}"
                     .format(pipeline,
@@ -289,11 +319,12 @@ class Processor(object):
                                       for p, ro in (
                                           ((pipeline, req_outputs),)
                                           + downstream[:(recur_index + 1)]))))
-            if pipeline.name in stack:
-                # Pop pipeline from stack in order to add it to the end of the
-                # stack and ensure it is run before all downstream pipelines
-                prev_pipeline, prev_req_outputs, prev_filt_array = stack.pop(
-                    pipeline.name)
+            # Pop pipeline from stack (if present) in order to add it to the
+            # end of the stack and ensure it is run before all downstream
+            # pipelines
+            prev = stack.pop(pipeline.name, None)
+            if prev is not None:
+                prev_pipeline, prev_req_outputs, prev_filt_array = prev
                 if pipeline is not prev_pipeline and pipeline != prev_pipeline:
                     raise ArcanaDesignError(
                         "Attempting to run two different pipelines with the "
@@ -354,7 +385,7 @@ class Processor(object):
                 try:
                     self._connect_pipeline(
                         pipeline, req_outputs, workflow, subject_inds,
-                        visit_inds, flt_array, **kwargs)
+                        visit_inds, flt_array, tree=tree, **kwargs)
                 except ArcanaNoRunRequiredException:
                     logger.info("Not running '{}' pipeline as its outputs "
                                 "are already present in the repository"
@@ -363,7 +394,10 @@ class Processor(object):
 #         workflow.write_graph(graph2use='flat', format='svg')
 #         print('Graph saved in {} directory'.format(os.getcwd()))
         # Actually run the generated workflow
-        if workflow._get_all_nodes():  # Check if workflow has any nodes to run
+        # Check if any pipeline workflows have been added to the top-level
+        # graph, which avoids expanding all the nested workflows into a flat
+        # set of nodes before NiPype does it again within 'run'
+        if workflow._graph.number_of_nodes():
             result = workflow.run(plugin=self._plugin)
         else:
             result = None
@@ -373,7 +407,8 @@ class Processor(object):
         return result
 
     def _connect_pipeline(self, pipeline, required_outputs, workflow,
-                          subject_inds, visit_inds, filter_array, force=False):
+                          subject_inds, visit_inds, filter_array, force=False,
+                          tree=None):
         """
         Connects a pipeline to a overarching workflow that sets up iterators
         over subjects|visits present in the repository (if required) and
@@ -403,6 +438,10 @@ class Processor(object):
             A flag to force the processing of all sessions in the filter
             array, regardless of whether the parameters|pipeline used
             to generate existing data matches the given pipeline
+        tree : Tree | None
+            The data tree of the analysis, which is passed in by 'run' to
+            ensure the same tree is used for all pipelines. If None it is
+            retrieved from the analysis' dataset
         """
         if self.reprocess == 'force':
             force = True
@@ -433,7 +472,8 @@ class Processor(object):
         # they don't contain the outputs of this pipeline)
         to_process_array, to_protect_array, to_skip_array = self._to_process(
             pipeline, required_outputs, prqs_to_process_array,
-            prqs_to_skip_array, filter_array, subject_inds, visit_inds, force)
+            prqs_to_skip_array, filter_array, subject_inds, visit_inds, force,
+            tree=tree)
         # Store the arrays signifying which nodes to process, protect or skip
         # so they can be passed to downstream pipelines
         pipeline.to_process_array = to_process_array
@@ -452,8 +492,9 @@ class Processor(object):
         # they are all processed before this pipeline is run.
         if final_nodes:
             prereqs = pipeline.add('prereqs', Merge(len(final_nodes)))
-            for i, final_node in enumerate(final_nodes, start=1):
-                workflow.connect(final_node, 'out', prereqs, 'in{}'.format(i))
+            workflow.connect([
+                (final_node, prereqs, [('out', 'in{}'.format(i))])
+                for i, final_node in enumerate(final_nodes, start=1)])
         else:
             prereqs = None
         # Construct iterator structure over subjects and sessions to be
@@ -461,31 +502,40 @@ class Processor(object):
         iter_nodes = self._iterate(pipeline, to_process_array, subject_inds,
                                    visit_inds)
         sources = {}
+        # Resolve the bound input specs and partition them by frequency in a
+        # single pass, as they are referenced again when connecting checksums
+        # to the sinks below
+        freq_inputs = defaultdict(list)
+        try:
+            for inpt in pipeline.inputs:
+                freq_inputs[inpt.frequency].append(inpt)
+        except ArcanaMissingDataException as e:
+            raise ArcanaMissingDataException(
+                str(e) + ", which is required for pipeline '{}'".format(
+                    pipeline.name))
         # Loop through each frequency present in the pipeline inputs and
         # create a corresponding source node
         for freq in pipeline.input_frequencies:
-            try:
-                inputs = list(pipeline.frequency_inputs(freq))
-            except ArcanaMissingDataException as e:
-                raise ArcanaMissingDataException(
-                    str(e) + ", which is required for pipeline '{}'".format(
-                        pipeline.name))
+            inputs = freq_inputs[freq]
             inputnode = pipeline.inputnode(freq)
             sources[freq] = source = pipeline.add(
                 '{}_source'.format(freq),
-                RepositorySource(
-                    i.slice for i in inputs),
+                RepositorySource([i.slice for i in inputs]),
                 inputs=({'prereqs': (prereqs, 'out')}
                         if prereqs is not None else {}))
-            # Connect iter_nodes to source and input nodes
-            for iterator in pipeline.iterators(freq):
+            # Connect iter_nodes to source and input nodes. The source and
+            # input nodes are generated from the same inputs and iterators
+            # so their traits are guaranteed to match and the connections can
+            # be made in a single batch without the checks in
+            # Pipeline.connect
+            iterators = pipeline.iterators(freq)
+            for iterator in iterators:
                 pipeline.connect(iter_nodes[iterator], iterator, source,
                                  iterator)
-                pipeline.connect(source, iterator, inputnode,
-                                 iterator)
-            for input in inputs:
-                pipeline.connect(source, input.suffixed_name,
-                                 inputnode, input.name)
+            pipeline.workflow.connect([(
+                source, inputnode,
+                [(i, i) for i in iterators]
+                + [(i.suffixed_name, i.name) for i in inputs])])
         deiter_nodes = {}
 
         def deiter_node_sort_key(it):
@@ -500,28 +550,30 @@ class Processor(object):
         # Connect all outputs to the repository sink, creating a new sink for
         # each frequency level (i.e 'per_session', 'per_subject', 'per_visit',
         # or 'per_dataset')
-        for freq in pipeline.output_frequencies:
-            outputs = list(pipeline.frequency_outputs(freq))
-            if pipeline.iterators(freq) - pipeline.iterators():
+        freq_outputs = defaultdict(list)
+        for output in pipeline.outputs:
+            freq_outputs[output.frequency].append(output)
+        for freq, outputs in freq_outputs.items():
+            # NB: the iterator nodes are keyed by the iterators of the
+            # pipeline
+            if pipeline.iterators(freq) - set(iter_nodes):
                 raise ArcanaDesignError(
                     "Doesn't make sense to output '{}', which are of '{}' "
                     "frequency, when the pipeline only iterates over '{}'"
                     .format("', '".join(o.name for o in outputs), freq,
-                            "', '".join(pipeline.iterators())))
+                            "', '".join(iter_nodes)))
             outputnode = pipeline.outputnode(freq)
             # Connect filesets/fields to sink to sink node, skipping outputs
             # that are analysis inputs
             to_connect = {o.suffixed_name: (outputnode, o.name)
                           for o in outputs if o.is_spec}
             # Connect iterators to sink node
-            to_connect.update(
-                {i: (iter_nodes[i], i) for i in pipeline.iterators()})
+            to_connect.update({i: (n, i) for i, n in iter_nodes.items()})
             # Connect checksums/values from sources to sink node in order to
             # save in provenance, joining where necessary
-            for input_freq in pipeline.input_frequencies:
+            for input_freq, inputs in freq_inputs.items():
                 checksums_to_connect = [
-                    i.checksum_suffixed_name
-                    for i in pipeline.frequency_inputs(input_freq)]
+                    i.checksum_suffixed_name for i in inputs]
                 if not checksums_to_connect:
                     # Rare case of a pipeline with no inputs only iter_nodes
                     # that will only occur in unittests in all likelihood
@@ -548,7 +600,7 @@ class Processor(object):
             sink = pipeline.add(
                 '{}_sink'.format(freq),
                 RepositorySink(
-                    (o.slice for o in outputs), pipeline,
+                    [o.slice for o in outputs], pipeline,
                     required_outputs),
                 inputs=to_connect)
             # "De-iterate" (join) over iterators to get back to single child
@@ -610,11 +662,14 @@ class Processor(object):
         # by the 'to_process' array) can be factorized into indepdent nodes,
         # i.e. all subjects to process have the same visits to process and
         # vice-versa.
+        # Get the iterators of the pipeline once as they are derived from the
+        # frequencies of all its inputs
+        iterators = pipeline.iterators()
         factorizable = True
-        if len(list(pipeline.iterators())) == 2:
+        if len(iterators) == 2:
             nz_rows = to_process_array[to_process_array.any(axis=1), :]
-            ref_row = nz_rows[0, :]
-            factorizable = all((r == ref_row).all() for r in nz_rows)
+            # Compare all non-zero rows against the first in a single pass
+            factorizable = (nz_rows == nz_rows[0, :]).all()
         # If the subject/visit IDs to process cannot be factorized into
         # indepedent iterators, determine which to make make dependent on the
         # other in order to avoid/minimise duplicatation of download attempts
@@ -648,7 +703,7 @@ class Processor(object):
         inv_visit_inds = {v: k for k, v in visit_inds.items()}
         # Create iterator for subjects
         iter_nodes = {}
-        if self.analysis.SUBJECT_ID in pipeline.iterators():
+        if self.analysis.SUBJECT_ID in iterators:
             fields = [self.analysis.SUBJECT_ID]
             if dependent == self.analysis.SUBJECT_ID:
                 fields.append(self.analysis.VISIT_ID)
@@ -661,11 +716,14 @@ class Processor(object):
                 subj_it.itersource = ('{}_{}'.format(pipeline.name,
                                                      self.analysis.VISIT_ID),
                                       self.analysis.VISIT_ID)
+                # Only map the visits that will be iterated over by the
+                # visit iterator
                 subj_it.iterables = [(
                     self.analysis.SUBJECT_ID,
                     {inv_visit_inds[n]: [inv_subj_inds[m]
                                          for m in col.nonzero()[0]]
-                     for n, col in enumerate(to_process_array.T)})]
+                     for n, col in enumerate(to_process_array.T)
+                     if col.any()})]
             else:
                 subj_it.iterables = (
                     self.analysis.SUBJECT_ID,
@@ -673,7 +731,7 @@ class Processor(object):
                      for n in to_process_array.any(axis=1).nonzero()[0]])
             iter_nodes[self.analysis.SUBJECT_ID] = subj_it
         # Create iterator for visits
-        if self.analysis.VISIT_ID in pipeline.iterators():
+        if self.analysis.VISIT_ID in iterators:
             fields = [self.analysis.VISIT_ID]
             if dependent == self.analysis.VISIT_ID:
                 fields.append(self.analysis.SUBJECT_ID)
@@ -684,11 +742,14 @@ class Processor(object):
                 visit_it.itersource = (
                     '{}_{}'.format(pipeline.name, self.analysis.SUBJECT_ID),
                     self.analysis.SUBJECT_ID)
+                # Only map the subjects that will be iterated over by the
+                # subject iterator
                 visit_it.iterables = [(
                     self.analysis.VISIT_ID,
-                    {inv_subj_inds[m]:[inv_visit_inds[n]
-                                       for n in row.nonzero()[0]]
-                     for m, row in enumerate(to_process_array)})]
+                    {inv_subj_inds[m]: [inv_visit_inds[n]
+                                        for n in row.nonzero()[0]]
+                     for m, row in enumerate(to_process_array)
+                     if row.any()})]
             else:
                 visit_it.iterables = (
                     self.analysis.VISIT_ID,
@@ -705,7 +766,7 @@ class Processor(object):
 
     def _to_process(self, pipeline, required_outputs, prqs_to_process_array,
                     to_skip_array, filter_array, subject_inds, visit_inds,
-                    force):
+                    force, tree=None):
         """
         Check whether the outputs of the pipeline are present in all sessions
         in the project repository and were generated with matching provenance.
@@ -746,6 +807,9 @@ class Processor(object):
             as it might be dilated by summary outputs (i.e. of frequency
             'per_visit', 'per_subject' or 'per_dataset'). So we still loop
             through all outputs and treat them like they don't exist
+        tree : Tree | None
+            The data tree of the analysis. If None it is retrieved from the
+            analysis' dataset
 
         Returns
         -------
@@ -755,17 +819,21 @@ class Processor(object):
             values represent subject/visit ID pairs to run the pipeline for
         """
         # Reference the analysis tree in local variable for convenience
-        tree = self.analysis.dataset.tree
+        if tree is None:
+            tree = self.analysis.dataset.tree
         # Check to see if the pipeline has any low frequency outputs, because
         # if not then each session can be processed indepdently. Otherwise,
         # the "session matrix" (as defined by subject_ids and visit_ids
         # passed to the Analysis class) needs to be complete, i.e. a session
         # exists (with the full complement of requird inputs) for each
         # subject/visit ID pair.
+        # Resolve the bound output specs once as they are referenced several
+        # times below
+        outputs = list(pipeline.outputs)
         summary_outputs = [
-            o.name for o in pipeline.outputs if o.frequency != 'per_session']
+            o.name for o in outputs if o.frequency != 'per_session']
         # Set of frequencies present in pipeline outputs
-        output_freqs = pipeline.output_frequencies
+        output_freqs = set(o.frequency for o in outputs)
         if summary_outputs:
             if list(tree.incomplete_subjects):
                 raise ArcanaUsageError(
@@ -790,6 +858,10 @@ class Processor(object):
             return (subject_inds.get(x.subject_id, 0),
                     visit_inds.get(x.visit_id, 0))
 
+        # Invert the index dictionaries to get index-to-ID maps
+        inv_subject_inds = {v: k for k, v in subject_inds.items()}
+        inv_visit_inds = {v: k for k, v in visit_inds.items()}
+
         # Initalise array to represent which sessions need to be reprocessed
         to_process_array = np.zeros((len(subject_inds), len(visit_inds)),
                                     dtype=bool)
@@ -802,8 +874,8 @@ class Processor(object):
         # As well as the the sessions that need to be protected or skipped,
         # keep track of the items in those sessions that are protected or
         # missing for more informative error messages
-        to_protect = defaultdict(list)
-        to_skip = defaultdict(list)
+        to_protect = {}
+        to_skip = {}
         # Check data tree for missing inputs
         for input in pipeline.inputs:
             # NB: Analysis inputs that don't have skip_missing set and have
@@ -811,16 +883,18 @@ class Processor(object):
             if input.skip_missing:
                 for item in input.slice:
                     if not item.exists:
-                        to_skip_array[array_inds(item)] = True
-                        to_skip[array_inds(item)].append(item)
+                        inds = array_inds(item)
+                        to_skip_array[inds] = True
+                        to_skip.setdefault(inds, []).append(item)
         # Dialate array over all iterators that are joined by the pipeline
         to_skip_array = self._dialate_array(to_skip_array, pipeline.joins)
         # Check data tree for missing required outputs
-        for output in pipeline.outputs:
+        for output in outputs:
             # Check to see if output is required by downstream processing
             required = (required_outputs is None
                         or output.name in required_outputs)
             for item in output.slice:
+                inds = array_inds(item)
                 if item.exists:
                     # Check to see if checksums recorded when derivative
                     # was generated by previous run match those of current file
@@ -833,37 +907,42 @@ class Processor(object):
                             "corrected outside of Arcana and will therefore "
                             "not overwrite. Please delete manually if this "
                             "is not intended".format(repr(item)))
-                        to_protect_array[array_inds(item)] = True
-                        to_protect[array_inds(item)].append(item)
+                        to_protect_array[inds] = True
+                        to_protect.setdefault(inds, []).append(item)
                     elif required:
                         if force:
-                            to_process_array[array_inds(item)] = True
+                            to_process_array[inds] = True
                         else:
-                            to_check_array[array_inds(item)] = True
+                            to_check_array[inds] = True
                 elif required:
-                    to_process_array[array_inds(item)] = True
+                    to_process_array[inds] = True
         # Filter sessions to process by those requested
         to_process_array *= filter_array
         to_check_array *= (filter_array * np.invert(to_process_array))
         if to_check_array.any() and self.prov_check:
             # Get list of sessions, subjects, visits, tree objects to check
             # their provenance against that of the pipeline
+            # NB: the nodes are looked up directly from the indices of the
+            # marked sessions instead of scanning the whole tree. If there
+            # are summary outputs the tree has already been checked to be
+            # complete above, otherwise only existing sessions are marked.
             to_check = []
             if 'per_session' in output_freqs:
                 to_check.extend(
-                    s for s in tree.sessions
-                    if to_check_array[subject_inds[s.subject_id],
-                                      visit_inds[s.visit_id]])
+                    tree.session(inv_subject_inds[i], inv_visit_inds[j])
+                    for i, j in zip(*np.nonzero(to_check_array)))
             if 'per_subject' in output_freqs:
                 # We can just test the first col of outputs_exist as rows
                 # should be either all True or all False
-                to_check.extend(s for s in tree.subjects
-                                if to_check_array[subject_inds[s.id], 0])
+                to_check.extend(
+                    tree.subject(inv_subject_inds[i])
+                    for i in np.nonzero(to_check_array[:, 0])[0])
             if 'per_visit' in output_freqs:
                 # We can just test the first row of outputs_exist as cols
                 # should be either all True or all False
-                to_check.extend(v for v in tree.visits
-                                if to_check_array[0, visit_inds[v.id]])
+                to_check.extend(
+                    tree.visit(inv_visit_inds[j])
+                    for j in np.nonzero(to_check_array[0, :])[0])
             if 'per_dataset' in output_freqs:
                 to_check.append(tree)
             for node in to_check:
@@ -908,10 +987,7 @@ class Processor(object):
                                 pipeline.name, node, msg))
 
         def inds_to_ids(inds):
-            subject_id = next(k for k, v in subject_inds.items()
-                              if v == inds[0])
-            visit_id = next(k for k, v in visit_inds.items() if v == inds[1])
-            return (subject_id, visit_id)
+            return (inv_subject_inds[inds[0]], inv_visit_inds[inds[1]])
 
         # Dialate to process array
         to_process_array = self._dialate_array(to_process_array,
@@ -922,11 +998,12 @@ class Processor(object):
             missing_prq_inputs_msg = ''
             for sess_inds in zip(*np.nonzero(intersection)):
                 subject_id, visit_id = inds_to_ids(sess_inds)
-                if sess_inds in to_skip:
+                skipped = to_skip.get(sess_inds)
+                if skipped is not None:
                     missing_inputs_msg += (
                         "\n(subject={}, visit={}): [{}]".format(
                             subject_id, visit_id,
-                            ', '.join(i.name for i in to_skip[sess_inds])))  # noqa pylint: disable=no-member
+                            ', '.join(i.name for i in skipped)))
                 else:
                     missing_prq_inputs_msg += (
                         "\n(subject={}, visit={})".format(subject_id,
@@ -947,22 +1024,26 @@ class Processor(object):
         conflicting = to_process_array * to_protect_array
         if conflicting.any():
             error_msg = ''
+            if required_outputs is None:
+                conflict_outputs = outputs
+            else:
+                conflict_outputs = [pipeline.analysis.bound_spec(r)
+                                    for r in required_outputs]
             for sess_inds in zip(*np.nonzero(conflicting)):
                 subject_id, visit_id = inds_to_ids(sess_inds)
-                if required_outputs is None:
-                    conflict_outputs = pipeline.outputs
-                else:
-                    conflict_outputs = [pipeline.analysis.bound_spec(r)
-                                        for r in required_outputs]
-                items = [
+                # Items are unique by name within a node so we can index the
+                # protected items by name instead of comparing each item
+                protected = to_protect.get(sess_inds, [])
+                protected_names = set(i.name for i in protected)
+                missing = [
                     o.slice.item(subject_id=subject_id, visit_id=visit_id)
-                    for o in conflict_outputs]
-                missing = [i for i in items if i not in to_protect[sess_inds]]
+                    for o in conflict_outputs
+                    if o.name not in protected_names]
                 error_msg += (
                     "\n({}, {}): protected=[{}], missing=[{}]"
                     .format(
                         subject_id, visit_id,
-                        ', '.join(i.name for i in to_protect[sess_inds]),  # noqa pylint: disable=no-member
+                        ', '.join(i.name for i in protected),
                         ', '.join(i.name for i in missing)))  # noqa pylint: disable=no-member
             raise ArcanaProtectedOutputConflictError(
                 "Cannot process {} as there are nodes with both protected "
@@ -13,6 +13,10 @@ class Repository(metaclass=ABCMeta):
     classes should implement.
     """
 
+    # Whether the data is stored on the local file-system, i.e. doesn't need
+    # to be downloaded to a cache before it can be accessed
+    is_local = False
+
     def __init__(self):
         self._connection_depth = 0
 
@@ -1,6 +1,7 @@
 import os
 import os.path as op
 import pickle as pkl
+import tempfile
 from logging import getLogger
 from arcana.exceptions import ArcanaUsageError
 from .tree import Tree
@@ -42,13 +43,18 @@ class Dataset():
         Maps subject IDs in dataset to a global name-space
     visit_id_map : dict[str, str]
         Maps visit IDs in dataset to a global name-space
+    cache_tree : bool
+        Whether to save the tree of the dataset in the cache directory of the
+        repository (if it has one) and reuse it in subsequent processes
+        instead of querying the repository again
     """
 
     type = 'basic'
 
     def __init__(self, name, repository=None, subject_ids=None, visit_ids=None,
                  fill_tree=False, depth=0, subject_id_map=None,
-                 visit_id_map=None, file_formats=(), clear_cache=True):
+                 visit_id_map=None, file_formats=(), clear_cache=True,
+                 cache_tree=False):
         if repository is None:
             # needs to be imported here to avoid circular imports
             from .local import LocalFileSystemRepo
@@ -59,11 +65,14 @@ class Dataset():
                     "exist".format(name))
         self._name = repository.standardise_name(name)
         self._repository = repository
+        # NB: Explicit IDs are stored as tuples to match the IDs read from the
+        # tree, so subject_ids/visit_ids return the same type either way
         self._subject_ids = (tuple(subject_ids)
                              if subject_ids is not None else None)
         self._visit_ids = tuple(visit_ids) if visit_ids is not None else None
         self._fill_tree = fill_tree
         self._depth = depth
+        self._cache_tree = cache_tree
         if clear_cache:
             self.clear_cache()
 
@@ -73,6 +82,8 @@ class Dataset():
         self._inv_visit_id_map = {}
         self._file_formats = file_formats
         self._cached_tree = None
+        self._cached_subject_ids = None
+        self._cached_visit_ids = None
 
     def __repr__(self):
         return "Dataset(name='{}', depth={}, repository={})".format(
@@ -104,14 +115,22 @@ class Dataset():
 
     @property
     def subject_ids(self):
+        """The subject IDs in the dataset (tuple[str])"""
         if self._subject_ids is None:
-            return [s.id for s in self.tree.subjects]
+            # Cache the IDs found in the tree until the tree is cleared
+            if self._cached_subject_ids is None:
+                self._cached_subject_ids = tuple(
+                    s.id for s in self.tree.subjects)
+            return self._cached_subject_ids
         return self._subject_ids
 
     @property
     def visit_ids(self):
+        """The visit IDs in the dataset (tuple[str])"""
         if self._visit_ids is None:
-            return [v.id for v in self.tree.visits]
+            if self._cached_visit_ids is None:
+                self._cached_visit_ids = tuple(v.id for v in self.tree.visits)
+            return self._cached_visit_ids
         return self._visit_ids
 
     @property
@@ -120,8 +139,8 @@ class Dataset():
             'name': self.name,
             'depth': self._depth,
             'repository': self.repository.prov,
-            'subject_ids': tuple(self.subject_ids),
-            'visit_ids': tuple(self.visit_ids)}
+            'subject_ids': self.subject_ids,
+            'visit_ids': self.visit_ids}
 
     @property
     def depth(self):
@@ -246,7 +265,7 @@ class Dataset():
             A hierarchical tree of subject, session and fileset
             information for the repository
         """
-        if self._cached_tree is None:
+        if self._cached_tree is None and self._cache_tree:
             try:
                 with open(self._tree_cache_path, 'rb') as f:
                     self._cached_tree = pkl.load(f)
@@ -254,8 +273,9 @@ class Dataset():
                 pass
             else:
                 cached_dataset = self._cached_tree.dataset
-                if (cached_dataset.name == self.name
-                        and cached_dataset.repository == self.repository):
+                # NB: Dataset equality includes the subject/visit ID filters
+                # that the tree was constructed with
+                if cached_dataset == self:
                     self._cached_tree._dataset = self
                 else:
                     logger.warning(
@@ -263,6 +283,7 @@ class Dataset():
                          "(name: '{}' v '{}', repository {} v {}) ").format(
                             cached_dataset.name, self.name,
                             cached_dataset.repository, self.repository))
+                    self._cached_tree = None
         if self._cached_tree is None:
             # Find all data present in the repository (filtered by the
             # passed IDs)
@@ -275,26 +296,51 @@ class Dataset():
                 fill_subjects=(self._subject_ids
                                 if self._fill_tree else None),
                 fill_visits=(self._visit_ids if self._fill_tree else None))
-            try:
-                with open(self._tree_cache_path, 'wb') as f:
-                    pkl.dump(self._cached_tree, f)
-            except TypeError:
-                pass  # No cache path
+            if self._cache_tree:
+                self._save_tree_cache()
         return self._cached_tree
 
+    def _save_tree_cache(self):
+        cache_path = self._tree_cache_path
+        if cache_path is None:
+            return
+        cache_dir = op.dirname(cache_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temporary file first and then move it into place so
+        # concurrent processes never read a partial tree
+        with tempfile.NamedTemporaryFile(dir=cache_dir, suffix='.tmp',
+                                         delete=False) as f:
+            tmp_path = f.name
+            try:
+                pkl.dump(self._cached_tree, f)
+            except Exception as e:  # Typically PicklingError
+                logger.warning(
+                    "Could not save data tree of {} to cache directory: {}"
+                    .format(self, e))
+                saved = False
+            else:
+                saved = True
+        try:
+            if saved:
+                os.replace(tmp_path, cache_path)
+        finally:
+            if op.exists(tmp_path):
+                os.remove(tmp_path)
+
     @property
     def _tree_cache_path(self):
         try:
-            cache_dir = self.repository.dataset_cache_dir(self.dataset_name)
+            cache_dir = self.repository.dataset_cache_dir(self.name)
         except AttributeError:
             cache_path = None
         else:
-            os.makedirs(cache_dir, exist_ok=True)
             cache_path = op.join(cache_dir, 'datatree-cache.pkl')
         return cache_path
 
     def clear_cache(self):
         self._cached_tree = None
+        self._cached_subject_ids = None
+        self._cached_visit_ids = None
         try:
             os.remove(self._tree_cache_path)
         except (FileNotFoundError, TypeError):
@@ -326,14 +372,12 @@ class Dataset():
     def _map_id(self, id, map, inv_map):
         if id is None:
             return None
-        mapped = id
+        if map is None:
+            return id
         if callable(map):
             mapped = map(id)
-        elif self._visit_id_map is not None:
-            try:
-                mapped = map(id)
-            except KeyError:
-                pass
+        else:
+            mapped = map.get(id, id)
         if mapped != id:
             # Check for multiple mappings onto the same ID
             try:
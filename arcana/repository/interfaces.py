@@ -38,26 +38,32 @@ class RepositoryInterface(BaseInterface):
 
     def __init__(self, collections):
         super(RepositoryInterface, self).__init__()
-        # Protect against iterators
-        collections = list(collections)
+        # Segregate into fileset and field collections and collate the set of
+        # frequencies and datasets in a single pass (also protects against
+        # iterators)
+        self.fileset_collections = []
+        self.field_collections = []
+        frequencies = set()
+        self.datasets = set()
+        for collection in collections:
+            if collection.is_fileset:
+                self.fileset_collections.append(collection)
+            elif collection.is_field:
+                self.field_collections.append(collection)
+            frequencies.add(collection.frequency)
+            self.datasets.update(i.dataset for i in collection
+                                 if i.dataset is not None)
         # Check for consistent frequencies in collections
-        frequencies = set(c.frequency for c in collections)
         if len(frequencies) > 1:
             raise ArcanaError(
                 "Attempting to sink multiple frequencies across collections {}"
-                .format(', '.join(str(c) for c in collections)))
+                .format(', '.join(str(c) for c in self.collections)))
         elif frequencies:
             # NB: Exclude very rare case where pipeline doesn't have inputs,
             #     would only really happen in unittests
             self._frequency = next(iter(frequencies))
         # Extract set of repositories used to source/sink from/to
-        self.datasets = set(chain(*(
-            (i.dataset for i in c if i.dataset is not None)
-            for c in collections)))
         self.repositories = set(d.repository for d in self.datasets)
-        # Segregate into fileset and field collections
-        self.fileset_collections = [c for c in collections if c.is_fileset]
-        self.field_collections = [c for c in collections if c.is_field]
 
     def __eq__(self, other):
         try:
@@ -88,11 +94,29 @@ class RepositoryInterface(BaseInterface):
 
     @classmethod
     def _add_trait(cls, spec, name, trait_type):
-        spec.add_trait(name, trait_type)
-        spec.trait_set(trait_change_notify=False, **{name: Undefined})
-        # Access the trait (not sure why but this is done in add_traits
+        cls._add_traits(spec, [(name, trait_type)])
+
+    @classmethod
+    def _add_traits(cls, spec, name_traits):
+        """
+        Adds multiple traits to the spec, initialising them all to Undefined
+        in a single 'trait_set' call instead of one call per trait
+
+        Parameters
+        ----------
+        spec : DynamicTraitedSpec
+            The spec to add the traits to
+        name_traits : list[tuple[str, TraitType]]
+            The names and types of the traits to add
+        """
+        for name, trait_type in name_traits:
+            spec.add_trait(name, trait_type)
+        spec.trait_set(trait_change_notify=False,
+                       **{n: Undefined for n, _ in name_traits})
+        # Access the traits (not sure why but this is done in add_traits
         # so I have also done it here
-        getattr(spec, name)
+        for name, _ in name_traits:
+            getattr(spec, name)
 
     @classmethod
     def field_trait(cls, field):
@@ -139,18 +163,18 @@ class RepositorySource(RepositoryInterface):
 
     def _outputs(self):
         outputs = super(RepositorySource, self)._outputs()
+        name_traits = []
         # Add traits for filesets to source and their checksums
         for fileset_slice in self.fileset_collections:
-            self._add_trait(outputs,
-                            fileset_slice.name + PATH_SUFFIX, PATH_TRAIT)
-            self._add_trait(outputs,
-                            fileset_slice.name + CHECKSUM_SUFFIX,
-                            CHECKSUM_TRAIT)
+            name_traits.append((fileset_slice.name + PATH_SUFFIX,
+                                PATH_TRAIT))
+            name_traits.append((fileset_slice.name + CHECKSUM_SUFFIX,
+                                CHECKSUM_TRAIT))
         # Add traits for fields to source
         for field_slice in self.field_collections:
-            self._add_trait(outputs,
-                            field_slice.name + FIELD_SUFFIX,
-                            self.field_trait(field_slice))
+            name_traits.append((field_slice.name + FIELD_SUFFIX,
+                                self.field_trait(field_slice)))
+        self._add_traits(outputs, name_traits)
         return outputs
 
     def _list_outputs(self):
@@ -201,9 +225,10 @@ class RepositorySink(RepositoryInterface):
         outputs repositor(y|ies)
     pipeline : arcana.pipeline.Pipeline
         The pipeline that has produced the outputs to sink
-    required : list[str]
+    required : list[str] | None
         Names of derivatives that are required by downstream nodes. Any
         undefined required derivatives that are undefined will raise an error.
+        If None, all derivatives are considered to be required
     """
 
     input_spec = RepositorySpec
@@ -211,19 +236,19 @@ class RepositorySink(RepositoryInterface):
 
     def __init__(self, collections, pipeline, required=()):
         super(RepositorySink, self).__init__(collections)
+        # The suffixed names of the input traits are generated once here
+        # instead of each time the sink is run
+        self._fileset_inputs = [(c, c.name + PATH_SUFFIX)
+                                for c in self.fileset_collections]
+        self._field_inputs = [(c, c.name + FIELD_SUFFIX)
+                              for c in self.field_collections]
         # Add traits for filesets to sink
-        for fileset_slice in self.fileset_collections:
-            self._add_trait(self.inputs,
-                            fileset_slice.name + PATH_SUFFIX,
-                            PATH_TRAIT)
+        name_traits = [(n, PATH_TRAIT) for _, n in self._fileset_inputs]
         # Add traits for fields to sink
-        for field_slice in self.field_collections:
-            self._add_trait(self.inputs,
-                            field_slice.name + FIELD_SUFFIX,
-                            self.field_trait(field_slice))
+        name_traits.extend((n, self.field_trait(c))
+                           for c, n in self._field_inputs)
         # Add traits for checksums/values of pipeline inputs
-        self._pipeline_input_filesets = []
-        self._pipeline_input_fields = []
+        self._pipeline_input_checksums = []
         for inpt in pipeline.inputs:
             if inpt.is_fileset:
                 trait_t = JOINED_CHECKSUM_TRAIT
@@ -231,17 +256,18 @@ class RepositorySink(RepositoryInterface):
                 trait_t = self.field_trait(inpt)
                 trait_t = traits.Either(trait_t, traits.List(trait_t),
                                         traits.List(traits.List(trait_t)))
-            self._add_trait(self.inputs, inpt.checksum_suffixed_name, trait_t)
-            if inpt.is_fileset:
-                self._pipeline_input_filesets.append(inpt.name)
-            elif inpt.is_field:
-                self._pipeline_input_fields.append(inpt.name)
-            else:
-                assert False
+            name_traits.append((inpt.checksum_suffixed_name, trait_t))
+            self._pipeline_input_checksums.append(
+                (inpt.name, inpt.checksum_suffixed_name))
+        self._add_traits(self.inputs, name_traits)
         self._prov = pipeline.prov
         self._pipeline_name = pipeline.name
         self._from_analysis = pipeline.analysis.name
-        self._required = required
+        if required is None:
+            # All outputs are required if not explicitly provided
+            required = (c.name for c in self.collections)
+        # Stored as a set as it is checked for every output sunk
+        self._required = frozenset(required)
 
     def _list_outputs(self):
         outputs = self.output_spec().get()
@@ -252,30 +278,25 @@ class RepositorySink(RepositoryInterface):
                     if isdefined(self.inputs.visit_id) else None)
         missing_inputs = []
         # Collate input checksums into a dictionary
-        input_checksums = {n: getattr(self.inputs, n + CHECKSUM_SUFFIX)
-                           for n in self._pipeline_input_filesets}
-        input_checksums.update({n: getattr(self.inputs, n + FIELD_SUFFIX)
-                                for n in self._pipeline_input_fields})
+        input_checksums = {n: getattr(self.inputs, t)
+                           for n, t in self._pipeline_input_checksums}
         output_checksums = {}
         with ExitStack() as stack:
             # Connect to set of repositories that the collections come from
             for repository in self.repositories:
                 stack.enter_context(repository)
-            for fileset_slice in self.fileset_collections:
+            for fileset_slice, trait_name in self._fileset_inputs:
                 fileset = fileset_slice.item(subject_id, visit_id)
-                path = getattr(self.inputs, fileset_slice.name + PATH_SUFFIX)
+                path = getattr(self.inputs, trait_name)
                 if not isdefined(path):
                     if fileset.name in self._required:
                         missing_inputs.append(fileset.name)
                     continue  # skip the upload for this fileset
                 fileset.path = path  # Push to repository
                 output_checksums[fileset.name] = fileset.checksums
-            for field_slice in self.field_collections:
-                field = field_slice.item(
-                    subject_id,
-                    visit_id)
-                value = getattr(self.inputs,
-                                field_slice.name + FIELD_SUFFIX)
+            for field_slice, trait_name in self._field_inputs:
+                field = field_slice.item(subject_id, visit_id)
+                value = getattr(self.inputs, trait_name)
                 if not isdefined(value):
                     if field.name in self._required:
                         missing_inputs.append(field.name)
@@ -14,7 +14,8 @@ from arcana.exceptions import (
     ArcanaRepositoryError,
     ArcanaMissingDataException,
     ArcanaInsufficientRepoDepthError)
-from arcana.utils import get_class_info, HOSTNAME, split_extension
+from arcana.utils import (
+    get_class_info, HOSTNAME, split_extension, makedirs)
 from .base import Repository
 
 
@@ -45,6 +46,7 @@ class LocalFileSystemRepo(Repository):
     """
 
     type = 'directory'
+    is_local = True
     SUMMARY_NAME = '__ALL__'
     FIELDS_FNAME = 'fields.json'
     PROV_DIR = '__prov__'
@@ -83,12 +85,19 @@ class LocalFileSystemRepo(Repository):
         if fileset._path is None:
             primary_path = self.fileset_path(fileset)
             aux_files = fileset.format.default_aux_file_paths(primary_path)
-            if not op.exists(primary_path):
+            # Side-car files sit alongside the primary file so list the
+            # directory once instead of checking each path separately
+            try:
+                dir_contents = frozenset(
+                    os.listdir(op.dirname(primary_path)))
+            except OSError:
+                dir_contents = frozenset()
+            if op.basename(primary_path) not in dir_contents:
                 raise ArcanaMissingDataException(
                     "{} does not exist in {}"
                     .format(fileset, self))
             for aux_name, aux_path in aux_files.items():
-                if not op.exists(aux_path):
+                if op.basename(aux_path) not in dir_contents:
                     raise ArcanaMissingDataException(
                         "{} is missing '{}' side car in {}"
                         .format(fileset, aux_name, self))
@@ -140,8 +149,11 @@ class LocalFileSystemRepo(Repository):
                     target_path).items():
                 shutil.copyfile(fileset.format.aux_files[aux_name], aux_path)
         elif op.isdir(fileset.path):
-            if op.exists(target_path):
+            try:
                 shutil.rmtree(target_path)
+            except OSError as e:
+                if e.errno != errno.ENOENT:
+                    raise
             shutil.copytree(fileset.path, target_path)
         else:
             assert False
@@ -171,8 +183,7 @@ class LocalFileSystemRepo(Repository):
 
     def put_record(self, record, dataset):
         fpath = self.prov_json_path(record, dataset)
-        if not op.exists(op.dirname(fpath)):
-            os.mkdir(op.dirname(fpath))
+        makedirs(op.dirname(fpath), exist_ok=True)
         record.save(fpath)
 
     # root_dir=None, all_from_analysis=None,
@@ -248,25 +259,28 @@ class LocalFileSystemRepo(Repository):
                 frequency = 'per_subject'
             else:
                 frequency = 'per_session'
-            filtered_files = self._filter_files(files, session_path)
-            for fname in filtered_files:
-                basename = split_extension(fname)[0]
+            # NB: The filtered paths are already joined to the session path
+            # and extensions are split once per file rather than once for
+            # each pair of files when matching up potential aux files
+            filtered_files = [
+                (f, split_extension(f)[0])
+                for f in self._filter_files(files, session_path)]
+            for fpath, basename in filtered_files:
                 all_filesets.append(
                     Fileset.from_path(
-                        op.join(session_path, fname),
+                        fpath,
                         frequency=frequency,
                         subject_id=subj_id, visit_id=visit_id,
                         dataset=dataset,
                         from_analysis=from_analysis,
                         potential_aux_files=[
-                            f for f in filtered_files
-                            if (split_extension(f)[0] == basename
-                                and f != fname)],
+                            f for f, b in filtered_files
+                            if b == basename and f != fpath],
                         **kwargs))
-            for fname in self._filter_dirs(dirs, session_path):
+            for dpath in self._filter_dirs(dirs, session_path):
                 all_filesets.append(
                     Fileset.from_path(
-                        op.join(session_path, fname),
+                        dpath,
                         frequency=frequency,
                         subject_id=subj_id, visit_id=visit_id,
                         dataset=dataset,
@@ -281,7 +295,7 @@ class LocalFileSystemRepo(Repository):
                           subject_id=subj_id, visit_id=visit_id,
                           dataset=dataset, from_analysis=from_analysis,
                           **kwargs)
-                    for k, v in list(dct.items()))
+                    for k, v in dct.items())
             if self.PROV_DIR in dirs:
                 if from_analysis is None:
                     raise ArcanaRepositoryError(
@@ -374,8 +388,9 @@ class LocalFileSystemRepo(Repository):
             # hold derived products)
             sess_dir = op.join(acq_dir, item.from_analysis)
         # Make session dir if required
-        if item.derived and not op.exists(sess_dir):
-            os.makedirs(sess_dir, stat.S_IRWXU | stat.S_IRWXG)
+        if item.derived:
+            makedirs(sess_dir, mode=(stat.S_IRWXU | stat.S_IRWXG),
+                     exist_ok=True)
         return op.join(sess_dir, fname)
 
     def fields_json_path(self, field, dataset=None):
@@ -18,6 +18,12 @@ logger = logging.getLogger('arcana')
 
 class TreeNode(object):
 
+    # NB: Trees can contain thousands of nodes so __slots__ are used to cut
+    # down on the per-node memory overhead
+    __slots__ = ('_filesets', '_fields', '_records', '_missing_records',
+                 '_duplicate_records', '_tree', '_all_filesets', '_all_data',
+                 '__weakref__')
+
     def __init__(self, filesets, fields, records):
         if filesets is None:
             filesets = []
@@ -53,7 +59,7 @@ class TreeNode(object):
         self._duplicate_records = []
         self._tree = None
         # Match up provenance records with items in the node
-        for item in chain(self.filesets, self.fields):
+        for item in self.data:
             if not item.derived:
                 continue  # Skip acquired items
             records = [r for r in self.records
@@ -71,17 +77,29 @@ class TreeNode(object):
         if not (isinstance(other, type(self))
                 or isinstance(self, type(other))):
             return False
-        return (tuple(self.filesets) == tuple(other.filesets)
+        # Compare the (ID|name, from_analysis) keys of the items before
+        # comparing the items themselves, as differing nodes will typically
+        # differ in these
+        return (self._filesets.keys() == other._filesets.keys()
+                and self._fields.keys() == other._fields.keys()
+                and self.filesets == other.filesets
                 and tuple(self.fields) == tuple(other.fields)
                 and tuple(self.records) == tuple(other.records))
 
     def __hash__(self):
-        return (hash(tuple(self.filesets)) ^ hash(tuple(self.fields))
-                ^ hash(tuple(self.fields)))
+        # NB: records aren't hashable so they aren't included
+        return hash(self.filesets) ^ hash(tuple(self.fields))
 
     @property
     def filesets(self):
-        return chain(*(d.values() for d in self._filesets.values()))
+        # The filesets of a node don't change after it is created so the
+        # flattened tuple is cached on first access
+        try:
+            return self._all_filesets
+        except AttributeError:
+            self._all_filesets = tuple(chain.from_iterable(
+                d.values() for d in self._filesets.values()))
+            return self._all_filesets
 
     @property
     def fields(self):
@@ -264,7 +282,11 @@ class TreeNode(object):
 
     @property
     def data(self):
-        return chain(self.filesets, self.fields)
+        try:
+            return self._all_data
+        except AttributeError:
+            self._all_data = self.filesets + tuple(self.fields)
+            return self._all_data
 
     def __ne__(self, other):
         return not (self == other)
@@ -331,15 +353,18 @@ class TreeNode(object):
         self._tree = weakref.ref(tree)
 
     def __getstate__(self):
-        if self._tree is not None:
-            dct = self.__dict__.copy()
+        dct = {}
+        for klass in type(self).__mro__[:-1]:  # skip 'object'
+            for attr in klass.__dict__.get('__slots__', ()):
+                if attr != '__weakref__' and hasattr(self, attr):
+                    dct[attr] = getattr(self, attr)
+        if dct.get('_tree') is not None:
             dct['_tree'] = dct['_tree']()
-        else:
-            dct = self.__dict__
         return dct
 
     def __setstate__(self, state):
-        self.__dict__ = state.copy()
+        for attr, value in state.items():
+            setattr(self, attr, value)
         if self._tree is not None:
             self._tree = weakref.ref(self._tree)
 
@@ -377,6 +402,8 @@ class Tree(TreeNode):
 
     frequency = 'per_dataset'
 
+    __slots__ = ('_subjects', '_visits', '_dataset')
+
     def __init__(self, subjects, visits, dataset, filesets=None,
                  fields=None, records=None, fill_subjects=None,
                  fill_visits=None, **kwargs):  # noqa: E501 @UnusedVariable
@@ -441,7 +468,7 @@ class Tree(TreeNode):
 
     @property
     def sessions(self):
-        return chain(*(s.sessions for s in self.subjects))
+        return (sess for subj in self.subjects for sess in subj.sessions)
 
     @property
     def tree(self):
@@ -517,25 +544,27 @@ class Tree(TreeNode):
         nodes : iterable[TreeNode]
         """
         if frequency is None:
-            nodes = chain(*(self._nodes(f)
-                            for f in ('per_dataset', 'per_subject',
-                                      'per_visit', 'per_session')))
+            nodes = chain.from_iterable(
+                self._nodes(f) for f in ('per_dataset', 'per_subject',
+                                         'per_visit', 'per_session'))
         else:
             nodes = self._nodes(frequency=frequency)
         return nodes
 
+    # Functions that return the nodes of the tree for each frequency, which
+    # are looked up in _nodes
+    _frequency_nodes = {
+        'per_session': lambda t: t.sessions,
+        'per_subject': lambda t: t.subjects,
+        'per_visit': lambda t: t.visits,
+        'per_dataset': lambda t: [t]}
+
     def _nodes(self, frequency):
-        if frequency == 'per_session':
-            nodes = chain(*(s.sessions for s in self.subjects))
-        elif frequency == 'per_subject':
-            nodes = self.subjects
-        elif frequency == 'per_visit':
-            nodes = self.visits
-        elif frequency == 'per_dataset':
-            nodes = [self]
-        else:
-            assert False
-        return nodes
+        try:
+            get_nodes = self._frequency_nodes[frequency]
+        except KeyError:
+            assert False, "Unrecognised frequency '{}'".format(frequency)
+        return get_nodes(self)
 
     def find_mismatch(self, other, indent=''):
         """
@@ -700,6 +729,8 @@ class Subject(TreeNode):
 
     frequency = 'per_subject'
 
+    __slots__ = ('_id', '_sessions')
+
     def __init__(self, subject_id, sessions, filesets=None,
                  fields=None, records=None):
         TreeNode.__init__(self, filesets, fields, records)
@@ -722,9 +753,11 @@ class Subject(TreeNode):
         return self._id < other._id
 
     def __eq__(self, other):
-        return (TreeNode.__eq__(self, other)and
-                self._id == other._id and
-                self._sessions == other._sessions)
+        # Compare IDs before the (much more expensive) contents
+        return (isinstance(other, Subject)
+                and self._id == other._id
+                and TreeNode.__eq__(self, other)
+                and self._sessions == other._sessions)
 
     def __hash__(self):
         return (TreeNode.__hash__(self) ^
@@ -831,6 +864,8 @@ class Visit(TreeNode):
 
     frequency = 'per_visit'
 
+    __slots__ = ('_id', '_sessions')
+
     def __init__(self, visit_id, sessions, filesets=None, fields=None,
                  records=None):
         TreeNode.__init__(self, filesets, fields, records)
@@ -849,9 +884,11 @@ class Visit(TreeNode):
         return self.id
 
     def __eq__(self, other):
-        return (TreeNode.__eq__(self, other) and
-                self._id == other._id and
-                self._sessions == other._sessions)
+        # Compare IDs before the (much more expensive) contents
+        return (isinstance(other, Visit)
+                and self._id == other._id
+                and TreeNode.__eq__(self, other)
+                and self._sessions == other._sessions)
 
     def __hash__(self):
         return (TreeNode.__hash__(self) ^
@@ -954,6 +991,8 @@ class Session(TreeNode):
 
     frequency = 'per_session'
 
+    __slots__ = ('_subject_id', '_visit_id', '_subject', '_visit')
+
     def __init__(self, subject_id, visit_id, filesets=None, fields=None,
                  records=None):
         TreeNode.__init__(self, filesets, fields, records)
@@ -971,9 +1010,11 @@ class Session(TreeNode):
         return self._subject_id
 
     def __eq__(self, other):
-        return (TreeNode.__eq__(self, other) and
-                self.subject_id == other.subject_id and
-                self.visit_id == other.visit_id)
+        # Compare IDs before the (much more expensive) contents
+        return (isinstance(other, Session)
+                and self._subject_id == other._subject_id
+                and self._visit_id == other._visit_id
+                and TreeNode.__eq__(self, other))
 
     def __hash__(self):
         return (TreeNode.__hash__(self) ^
@@ -981,10 +1022,8 @@ class Session(TreeNode):
                 hash(self.visit_id))
 
     def __lt__(self, other):
-        if self.subject_id < other.subject_id:
-            return True
-        else:
-            return self.visit_id < other.visit_id
+        return ((self._subject_id, self._visit_id)
+                < (other._subject_id, other._visit_id))
 
     @property
     def subject(self):
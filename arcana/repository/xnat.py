@@ -20,7 +20,8 @@ from arcana.exceptions import (
     ArcanaError, ArcanaUsageError, ArcanaFileFormatError,
     ArcanaWrongRepositoryError)
 from arcana.pipeline.provenance import Record
-from arcana.utils import dir_modtime, get_class_info, parse_value
+from arcana.utils import (
+    dir_modtime, get_class_info, parse_value, link_or_copy)
 import xnat
 from .dataset import Dataset
 
@@ -89,8 +90,11 @@ class XnatRepo(Repository):
         self._password = password
         self._race_cond_delay = race_cond_delay
         self._check_md5 = check_md5
-        self._session_filter = session_filter
+        # Compile the session filter once rather than on each access
+        self._session_filter = (re.compile(session_filter)
+                                if session_filter is not None else None)
         self._login = None
+        self._xsessions = {}
 
     def __hash__(self):
         return (hash(self.server)
@@ -117,12 +121,14 @@ class XnatRepo(Repository):
         dct = self.__dict__.copy()
         del dct['_login']
         del dct['_connection_depth']
+        del dct['_xsessions']
         return dct
     
     def __setstate__(self, state):
         self.__dict__.update(state)
         self._login = None
         self._connection_depth = 0
+        self._xsessions = {}
 
     @property
     def prov(self):
@@ -154,8 +160,7 @@ class XnatRepo(Repository):
 
     @property
     def session_filter(self):
-        return (re.compile(self._session_filter)
-                if self._session_filter is not None else None)
+        return self._session_filter
 
     def connect(self):
         """
@@ -177,6 +182,8 @@ class XnatRepo(Repository):
     def disconnect(self):
         self._login.disconnect()
         self._login = None
+        # XNAT objects are bound to the login they were retrieved with
+        self._xsessions = {}
 
     def dataset(self, name, **kwargs):
         """
@@ -300,18 +307,20 @@ class XnatRepo(Repository):
             # Make session cache dir
             cache_path_dir = (op.dirname(cache_path)
                               if fileset.format.directory else cache_path)
-            if os.path.exists(cache_path_dir):
+            try:
                 shutil.rmtree(cache_path_dir)
+            except OSError as e:
+                if e.errno != errno.ENOENT:
+                    raise
             os.makedirs(cache_path_dir, stat.S_IRWXU | stat.S_IRWXG)
             if fileset.format.directory:
                 shutil.copytree(fileset.path, cache_path)
             else:
-                # Copy primary file
-                shutil.copyfile(fileset.path,
-                                op.join(cache_path, fileset.fname))
-                # Copy auxiliaries
+                # Link (or copy if on another file-system) primary file
+                link_or_copy(fileset.path, op.join(cache_path, fileset.fname))
+                # Link/copy auxiliaries
                 for sc_fname, sc_path in fileset.aux_file_fnames_and_paths:
-                    shutil.copyfile(sc_path, op.join(cache_path, sc_fname))
+                    link_or_copy(sc_path, op.join(cache_path, sc_fname))
             with open(cache_path + XnatRepo.MD5_SUFFIX, 'w',
                       **JSON_ENCODING) as f:
                 json.dump(fileset.calculate_checksums(), f, indent=2)
@@ -355,9 +364,11 @@ class XnatRepo(Repository):
     def put_record(self, record, dataset):
         base_cache_path = self._cache_path(
             record, name=self.PROV_SCAN, dataset=dataset)
-        if not op.exists(base_cache_path):
+        try:
             os.mkdir(base_cache_path)
-        else:
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
             if not op.isdir(base_cache_path):
                 raise ArcanaError(
                     "Base provenance cache path ('{}') should be a directory"
@@ -442,18 +453,32 @@ class XnatRepo(Repository):
         # Note we prefer the use of raw REST API calls here for performance
         # reasons over using XnatPy's data structures.
         with self:
-            # Get map of internal subject IDs to subject labels in project
-            subject_xids_to_labels = {
-                s['ID']: s['label'] for s in self._login.get_json(
-                    '/data/projects/{}/subjects'.format(project_id))[
-                        'ResultSet']['Result']}
-            # Get list of all sessions within project
-            session_xids = [
-                s['ID'] for s in self._login.get_json(
-                    '/data/projects/{}/experiments'.format(project_id))[
-                        'ResultSet']['Result']
-                if (self.session_filter is None
-                    or self.session_filter.match(s['label']))]
+            # Get list of all sessions within project along with the labels
+            # of the subjects they belong to in a single query (rather than
+            # separately listing the subjects in the project)
+            sessions_json = self._login.get_json(
+                '/data/projects/{}/experiments'.format(project_id),
+                query={'columns': 'ID,label,subject_ID,subject_label'})[
+                    'ResultSet']['Result']
+            session_filter = self.session_filter
+            subject_xids_to_labels = {}
+            session_xids = []
+            for s in sessions_json:
+                if not (session_filter is None
+                        or session_filter.match(s['label'])):
+                    continue
+                subject_label = s['subject_label']
+                # Skip sessions of subjects that are filtered out before
+                # requesting their full details
+                if subject_ids is not None:
+                    subj_id = subject_label
+                    if subj_id.startswith(project_id + '_'):
+                        subj_id = subj_id[len(project_id) + 1:]
+                    if not (subj_id == XnatRepo.SUMMARY_NAME
+                            or subj_id in subject_ids):
+                        continue
+                subject_xids_to_labels[s['subject_ID']] = subject_label
+                session_xids.append(s['ID'])
             for session_xid in tqdm(session_xids,
                                     "Scanning sessions in '{}' project"
                                     .format(project_id)):
@@ -469,21 +494,18 @@ class XnatRepo(Repository):
                 # Get field values. We do this first so we can check for the
                 # DERIVED_FROM_FIELD to determine the correct session label and
                 # analysis name
+                # Index the child elements of the session by field once
+                # rather than searching them for each field of interest
+                session_children = {c['field']: c['items']
+                                    for c in session_json['children']}
                 field_values = {}
-                try:
-                    fields_json = next(
-                        c['items'] for c in session_json['children']
-                        if c['field'] == 'fields/field')
-                except StopIteration:
-                    pass
-                else:
-                    for js in fields_json:
-                        try:
-                            value = js['data_fields']['field']
-                        except KeyError:
-                            pass
-                        else:
-                            field_values[js['data_fields']['name']] = value
+                for js in session_children.get('fields/field', ()):
+                    try:
+                        value = js['data_fields']['field']
+                    except KeyError:
+                        pass
+                    else:
+                        field_values[js['data_fields']['name']] = value
                 # Extract analysis name and derived-from session
                 if self.DERIVED_FROM_FIELD in field_values:
                     df_sess_label = field_values.pop(self.DERIVED_FROM_FIELD)
@@ -532,13 +554,7 @@ class XnatRepo(Repository):
                         from_analysis=from_analysis,
                         **kwargs))
                 # Extract part of JSON relating to files
-                try:
-                    scans_json = next(
-                        c['items'] for c in session_json['children']
-                        if c['field'] == 'scans/scan')
-                except StopIteration:
-                    scans_json = []
-                for scan_json in scans_json:
+                for scan_json in session_children.get('scans/scan', ()):
                     scan_id = scan_json['data_fields']['ID']
                     scan_type = scan_json['data_fields'].get('type', '')
                     scan_quality = scan_json['data_fields'].get('quality',
@@ -557,28 +573,23 @@ class XnatRepo(Repository):
                     # Remove auto-generated snapshots directory
                     resources.pop('SNAPSHOTS', None)
                     if scan_type == self.PROV_SCAN:
-                        # Download provenance JSON files and parse into
-                        # records
-                        temp_dir = tempfile.mkdtemp()
-                        try:
-                            with tempfile.TemporaryFile() as temp_zip:
-                                self._login.download_stream(
-                                    scan_uri + '/files', temp_zip,
-                                    format='zip')
-                                with ZipFile(temp_zip) as zip_file:
-                                    zip_file.extractall(temp_dir)
-                            for base_dir, _, fnames in os.walk(temp_dir):
-                                for fname in fnames:
-                                    if fname.endswith('.json'):
-                                        pipeline_name = fname[:-len('.json')]
-                                        json_path = op.join(base_dir, fname)
-                                        all_records.append(
-                                            Record.load(
-                                                pipeline_name, frequency,
-                                                subject_id, visit_id,
-                                                from_analysis, json_path))
-                        finally:
-                            shutil.rmtree(temp_dir, ignore_errors=True)
+                        # Download provenance JSON files and parse them
+                        # into records straight from the zip archive
+                        # rather than extracting them to disk first
+                        with tempfile.TemporaryFile() as temp_zip:
+                            self._login.download_stream(
+                                scan_uri + '/files', temp_zip, format='zip')
+                            with ZipFile(temp_zip) as zip_file:
+                                for member in zip_file.namelist():
+                                    fname = member.split('/')[-1]
+                                    if not fname.endswith('.json'):
+                                        continue
+                                    prov = json.loads(
+                                        zip_file.read(member).decode('utf-8'))
+                                    all_records.append(Record(
+                                        fname[:-len('.json')], frequency,
+                                        subject_id, visit_id, from_analysis,
+                                        prov))
                     else:
                         for resource in resources:
                             all_filesets.append(Fileset(
@@ -631,10 +642,14 @@ class XnatRepo(Repository):
             response = self._login.get(
                 '/REST/services/dicomdump?src='
                 + fileset.uri[len('/data'):]).json()['ResultSet']['Result']
-        hdr = {tag_parse_re.match(t['tag1']).groups(): convert(t['value'],
-                                                               t['vr'])
-               for t in response if (tag_parse_re.match(t['tag1'])
-                                     and t['vr'] in RELEVANT_DICOM_TAG_TYPES)}
+        hdr = {}
+        for t in response:
+            if t['vr'] not in RELEVANT_DICOM_TAG_TYPES:
+                continue
+            # Only parse the tag once (and only for relevant types)
+            match = tag_parse_re.match(t['tag1'])
+            if match:
+                hdr[match.groups()] = convert(t['value'], t['vr'])
         return hdr
 
     def download_fileset(self, tmp_dir, xresource, xscan, fileset,
@@ -644,7 +659,9 @@ class XnatRepo(Repository):
         with open(zip_path, 'wb') as f:
             xresource.xnat_session.download_stream(
                 xresource.uri + '/files', f, format='zip', verbose=True)
-        checksums = self.get_checksums(fileset)
+        # NB: The checksums are cached on the fileset so they aren't requested
+        # a second time if they were already retrieved to check the cache
+        checksums = fileset.checksums
         # Extract downloaded zip file
         expanded_dir = op.join(tmp_dir, 'expanded')
         try:
@@ -708,6 +725,14 @@ class XnatRepo(Repository):
         if dataset is None:
             dataset = item.dataset
         subj_label, sess_label = self._get_item_labels(item, dataset=dataset)
+        # Sessions are cached for the lifetime of the connection so items
+        # from the same session (e.g. all inputs of a source node) don't
+        # need to look up the project, subject and session each time
+        key = (dataset.name, subj_label, sess_label)
+        try:
+            return self._xsessions[key]
+        except KeyError:
+            pass
         with self:
             xproject = self._login.projects[dataset.name]
             try:
@@ -724,6 +749,7 @@ class XnatRepo(Repository):
                     xsession.fields[
                         self.DERIVED_FROM_FIELD] = self._get_item_labels(
                             item, dataset=dataset, no_from_analysis=True)[1]
+            self._xsessions[key] = xsession
         return xsession
 
     def _get_item_labels(self, item, no_from_analysis=False, dataset=None):
@@ -750,22 +776,18 @@ class XnatRepo(Repository):
         # FIXME: Move this logic into the dataset map IDs and make them
         #        default arguments for 'dataset' method
         if frequency == 'per_session':
-            subj_label = '{}_{}'.format(project_id, subject_id)
-            sess_label = '{}_{}_{}'.format(project_id, subject_id, visit_id)
+            pass
         elif frequency == 'per_subject':
-            subj_label = '{}_{}'.format(project_id, subject_id)
-            sess_label = '{}_{}_{}'.format(project_id, subject_id,
-                                           self.SUMMARY_NAME)
+            visit_id = self.SUMMARY_NAME
         elif frequency == 'per_visit':
-            subj_label = '{}_{}'.format(project_id, self.SUMMARY_NAME)
-            sess_label = '{}_{}_{}'.format(project_id, self.SUMMARY_NAME,
-                                           visit_id)
+            subject_id = self.SUMMARY_NAME
         elif frequency == 'per_dataset':
-            subj_label = '{}_{}'.format(project_id, self.SUMMARY_NAME)
-            sess_label = '{}_{}_{}'.format(project_id, self.SUMMARY_NAME,
-                                           self.SUMMARY_NAME)
+            subject_id = visit_id = self.SUMMARY_NAME
         else:
             assert False
+        # The session label is always prefixed by the subject label
+        subj_label = project_id + '_' + str(subject_id)
+        sess_label = subj_label + '_' + str(visit_id)
         return (subj_label, sess_label)
 
     def _cache_path(self, fileset, name=None, dataset=None):
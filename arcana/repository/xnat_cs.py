@@ -281,7 +281,7 @@ class XnatCSRepo(LocalFileSystemRepo):
                           subject_id=subj_id, visit_id=visit_id,
                           dataset=dataset, from_analysis=from_analysis,
                           **kwargs)
-                    for k, v in list(dct.items()))
+                    for k, v in dct.items())
             if self.PROV_DIR in dirs:
                 if from_analysis is None:
                     raise ArcanaRepositoryError(
@@ -2,4 +2,5 @@ from .base import (
     split_extension, classproperty, lower, JSON_ENCODING, parse_value,
     run_matlab_cmd, find_mismatch, package_dir, dir_modtime,
     PATH_SUFFIX, FIELD_SUFFIX, CHECKSUM_SUFFIX, ExitStack, makedirs,
-    get_class_info, HOSTNAME, extract_package_version, wrap_text)
+    get_class_info, HOSTNAME, extract_package_version, wrap_text,
+    link_or_copy)
@@ -55,18 +55,19 @@ def split_extension(path):
     ext : str
         The extension part of the string, i.e. 'nii.gz' of 'file.nii.gz'
     """
-    for double_ext in double_exts:
-        if path.endswith(double_ext):
-            return path[:-len(double_ext)], double_ext
-    dirname = os.path.dirname(path)
-    filename = os.path.basename(path)
-    parts = filename.split('.')
-    if len(parts) == 1:
+    # Check all compound extensions in a single call before finding which
+    # one matched, as most paths won't have one
+    if path.endswith(double_exts):
+        for double_ext in double_exts:
+            if path.endswith(double_ext):
+                return path[:-len(double_ext)], double_ext
+    dirname, filename = os.path.split(path)
+    base, sep, ext = filename.rpartition('.')
+    if sep:
+        ext = '.' + ext
+    else:
         base = filename
         ext = None
-    else:
-        ext = '.' + parts[-1]
-        base = '.'.join(parts[:-1])
     return os.path.join(dirname, base), ext
 
 
@@ -96,6 +97,24 @@ else:
                 raise
 
 
+def link_or_copy(src, dst):
+    """
+    Hard-links the file at 'src' to 'dst', falling back to copying it if
+    the two paths are on different file-systems (or links aren't supported)
+
+    Parameters
+    ----------
+    src : str
+        Path to the file to link/copy
+    dst : str
+        Path to link/copy the file to
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
 def parse_single_value(value, dtype=None):
     """
     Tries to convert to int, float and then gives up and assumes the value
@@ -187,6 +187,11 @@ class MultiMultiAnalysis(MultiAnalysis, metaclass=MultiAnalysisMetaClass):
         return pipeline
 
 
+def get_parameter_values(analysis, names):
+    """Returns the values of the named parameters of the analysis in a dict"""
+    return {n: analysis._get_parameter(n).value for n in names}
+
+
 class TestMulti(BaseTestCase):
 
     INPUT_FILESETS = {'ones': '1'}
@@ -204,22 +209,20 @@ class TestMulti(BaseTestCase):
         self.assertContentsEqual(e, 3.0)
         self.assertContentsEqual(f, 6.0)
         # Test parameter values in MultiAnalysis
-        self.assertEqual(analysis._get_parameter('p1').value, 100)
-        self.assertEqual(analysis._get_parameter('p2').value, '200')
-        self.assertEqual(analysis._get_parameter('p3').value, 300.0)
-        self.assertEqual(analysis._get_parameter('q1').value, 150)
-        self.assertEqual(analysis._get_parameter('q2').value, '250')
-        self.assertEqual(analysis._get_parameter('required_op').value, 'mul')
+        self.assertEqual(
+            get_parameter_values(analysis, ['p1', 'p2', 'p3', 'q1', 'q2',
+                                            'required_op']),
+            {'p1': 100, 'p2': '200', 'p3': 300.0, 'q1': 150, 'q2': '250',
+             'required_op': 'mul'})
         # Test parameter values in SubComp
         ss1 = analysis.subcomp('ss1')
-        self.assertEqual(ss1._get_parameter('o1').value, 100)
-        self.assertEqual(ss1._get_parameter('o2').value, '200')
-        self.assertEqual(ss1._get_parameter('o3').value, 300.0)
+        self.assertEqual(
+            get_parameter_values(ss1, ['o1', 'o2', 'o3']),
+            {'o1': 100, 'o2': '200', 'o3': 300.0})
         ss2 = analysis.subcomp('ss2')
-        self.assertEqual(ss2._get_parameter('o1').value, 150)
-        self.assertEqual(ss2._get_parameter('o2').value, '250')
-        self.assertEqual(ss2._get_parameter('o3').value, 300.0)
-        self.assertEqual(ss2._get_parameter('product_op').value, 'mul')
+        self.assertEqual(
+            get_parameter_values(ss2, ['o1', 'o2', 'o3', 'product_op']),
+            {'o1': 150, 'o2': '250', 'o3': 300.0, 'product_op': 'mul'})
 
     def test_partial_multi_analysis(self):
         analysis = self.create_analysis(
@@ -235,23 +238,20 @@ class TestMulti(BaseTestCase):
         self.assertContentsEqual(analysis.data('ss2_y', derive=True), 3.0)
         self.assertContentsEqual(ss2_z, 6.0)
         # Test parameter values in MultiAnalysis
-        self.assertEqual(analysis._get_parameter('p1').value, 1000)
-        self.assertEqual(analysis._get_parameter('ss1_o2').value, '2')
-        self.assertEqual(analysis._get_parameter('ss1_o3').value, 3.0)
-        self.assertEqual(analysis._get_parameter('ss2_o2').value, '20')
-        self.assertEqual(analysis._get_parameter('ss2_o3').value, 30.0)
-        self.assertEqual(analysis._get_parameter('ss2_product_op').value,
-                         'mul')
+        self.assertEqual(
+            get_parameter_values(analysis, ['p1', 'ss1_o2', 'ss1_o3', 'ss2_o2',
+                                            'ss2_o3', 'ss2_product_op']),
+            {'p1': 1000, 'ss1_o2': '2', 'ss1_o3': 3.0, 'ss2_o2': '20',
+             'ss2_o3': 30.0, 'ss2_product_op': 'mul'})
         # Test parameter values in SubComp
         ss1 = analysis.subcomp('ss1')
-        self.assertEqual(ss1._get_parameter('o1').value, 1000)
-        self.assertEqual(ss1._get_parameter('o2').value, '2')
-        self.assertEqual(ss1._get_parameter('o3').value, 3.0)
+        self.assertEqual(
+            get_parameter_values(ss1, ['o1', 'o2', 'o3']),
+            {'o1': 1000, 'o2': '2', 'o3': 3.0})
         ss2 = analysis.subcomp('ss2')
-        self.assertEqual(ss2._get_parameter('o1').value, 1000)
-        self.assertEqual(ss2._get_parameter('o2').value, '20')
-        self.assertEqual(ss2._get_parameter('o3').value, 30.0)
-        self.assertEqual(ss2._get_parameter('product_op').value, 'mul')
+        self.assertEqual(
+            get_parameter_values(ss2, ['o1', 'o2', 'o3', 'product_op']),
+            {'o1': 1000, 'o2': '20', 'o3': 30.0, 'product_op': 'mul'})
 
     def test_multi_multi_analysis(self):
         analysis = self.create_analysis(
@@ -268,41 +268,39 @@ class TestMulti(BaseTestCase):
                         Parameter('partial_ss2_product_op', 'mul')])
         self.assertContentsEqual(analysis.data('g', derive=True), 11.0)
         # Test parameter values in MultiAnalysis
-        self.assertEqual(analysis._get_parameter('full_p1').value, 100)
-        self.assertEqual(analysis._get_parameter('full_p2').value, '200')
-        self.assertEqual(analysis._get_parameter('full_p3').value, 300.0)
-        self.assertEqual(analysis._get_parameter('full_q1').value, 150)
-        self.assertEqual(analysis._get_parameter('full_q2').value, '250')
-        self.assertEqual(analysis._get_parameter('full_required_op').value,
-                         'mul')
+        self.assertEqual(
+            get_parameter_values(analysis, ['full_p1', 'full_p2', 'full_p3',
+                                            'full_q1', 'full_q2',
+                                            'full_required_op']),
+            {'full_p1': 100, 'full_p2': '200', 'full_p3': 300.0,
+             'full_q1': 150, 'full_q2': '250', 'full_required_op': 'mul'})
         # Test parameter values in SubComp
         ss1 = analysis.subcomp('full').subcomp('ss1')
-        self.assertEqual(ss1._get_parameter('o1').value, 100)
-        self.assertEqual(ss1._get_parameter('o2').value, '200')
-        self.assertEqual(ss1._get_parameter('o3').value, 300.0)
+        self.assertEqual(
+            get_parameter_values(ss1, ['o1', 'o2', 'o3']),
+            {'o1': 100, 'o2': '200', 'o3': 300.0})
         ss2 = analysis.subcomp('full').subcomp('ss2')
-        self.assertEqual(ss2._get_parameter('o1').value, 150)
-        self.assertEqual(ss2._get_parameter('o2').value, '250')
-        self.assertEqual(ss2._get_parameter('o3').value, 300.0)
-        self.assertEqual(ss2._get_parameter('product_op').value, 'mul')
+        self.assertEqual(
+            get_parameter_values(ss2, ['o1', 'o2', 'o3', 'product_op']),
+            {'o1': 150, 'o2': '250', 'o3': 300.0, 'product_op': 'mul'})
         # Test parameter values in MultiAnalysis
-        self.assertEqual(analysis._get_parameter('partial_p1').value, 1000)
-        self.assertEqual(analysis._get_parameter('partial_ss1_o2').value, '2')
-        self.assertEqual(analysis._get_parameter('partial_ss1_o3').value, 3.0)
-        self.assertEqual(analysis._get_parameter('partial_ss2_o2').value, '20')
-        self.assertEqual(analysis._get_parameter('partial_ss2_o3').value, 30.0)
         self.assertEqual(
-            analysis._get_parameter('partial_ss2_product_op').value, 'mul')
+            get_parameter_values(analysis, ['partial_p1', 'partial_ss1_o2',
+                                            'partial_ss1_o3', 'partial_ss2_o2',
+                                            'partial_ss2_o3',
+                                            'partial_ss2_product_op']),
+            {'partial_p1': 1000, 'partial_ss1_o2': '2', 'partial_ss1_o3': 3.0,
+             'partial_ss2_o2': '20', 'partial_ss2_o3': 30.0,
+             'partial_ss2_product_op': 'mul'})
         # Test parameter values in SubComp
         ss1 = analysis.subcomp('partial').subcomp('ss1')
-        self.assertEqual(ss1._get_parameter('o1').value, 1000)
-        self.assertEqual(ss1._get_parameter('o2').value, '2')
-        self.assertEqual(ss1._get_parameter('o3').value, 3.0)
+        self.assertEqual(
+            get_parameter_values(ss1, ['o1', 'o2', 'o3']),
+            {'o1': 1000, 'o2': '2', 'o3': 3.0})
         ss2 = analysis.subcomp('partial').subcomp('ss2')
-        self.assertEqual(ss2._get_parameter('o1').value, 1000)
-        self.assertEqual(ss2._get_parameter('o2').value, '20')
-        self.assertEqual(ss2._get_parameter('o3').value, 30.0)
-        self.assertEqual(ss2._get_parameter('product_op').value, 'mul')
+        self.assertEqual(
+            get_parameter_values(ss2, ['o1', 'o2', 'o3', 'product_op']),
+            {'o1': 1000, 'o2': '20', 'o3': 30.0, 'product_op': 'mul'})
 
     def test_missing_parameter(self):
         # Misses the required 'full_required_op' parameter, which sets
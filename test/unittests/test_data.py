@@ -1,9 +1,8 @@
-import tempfile
-import shutil
 import os
 import os.path as op
 import unittest
 from unittest import TestCase
+from io import BytesIO
 from nipype.interfaces.utility import IdentityInterface
 from arcana.utils.testing import BaseTestCase, BaseMultiSubjectTestCase
 from arcana.analysis.base import Analysis, AnalysisMetaClass
@@ -80,24 +79,15 @@ class TestFilesetSpecPickle(TestCase):
     filesets = []
     fields = []
 
-    def setUp(self):
-        self.tmp_dir = tempfile.mkdtemp()
-        self.pkl_dir = tempfile.mkdtemp()
-
-    def tearDown(self):
-        shutil.rmtree(self.tmp_dir)
-        shutil.rmtree(self.pkl_dir)
-
     def test_fileset_and_field(self):
         objs = [FilesetSpec('a', text_format,
                             'dummy_pipeline1'),
                 FieldSpec('b', int, 'dummy_pipeline2')]
-        for i, obj in enumerate(objs):
-            fname = op.join(self.pkl_dir, '{}.pkl'.format(i))
-            with open(fname, 'wb') as f:
-                pkl.dump(obj, f)
-            with open(fname, 'rb') as f:
-                re_obj = pkl.load(f)
+        for obj in objs:
+            buf = BytesIO()
+            pkl.dump(obj, buf, pkl.HIGHEST_PROTOCOL)
+            buf.seek(0)
+            re_obj = pkl.load(buf)
             self.assertEqual(obj, re_obj)
 
 